@@ -0,0 +1,303 @@
+# BenchBot.py - End-To-End Bot Benchmark (Fake Project APIs -> TelegramLoggerBot -> Fake Telegram)
+#
+#   python BenchBot.py --projects 20 --logs 500 --latency 50 --failure-rate 0.05
+#   python BenchBot.py --projects 5 --rate 200 --duration 30 --batch --json --output bench_bot.json
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime
+from aiohttp import web
+from telethon import errors
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+try:
+    import config  # noqa
+except ImportError:  # No credentials needed: Telegram is faked
+    sys.modules['config'] = importlib.import_module('config_bac')
+import LogGram
+
+TOKEN_PATTERN = re.compile(r'bench:(\d+):(\d+)')  # bench:<project>:<seq> in every log message
+
+
+class FakeProjectAPI:
+    """Stand-In /logs (Cursor Paging, Latency, Random Failures)"""
+
+    def __init__(self, index: int, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0):
+        self.index = index
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.logs = []  # Cursor == position + 1
+        self.created = []  # monotonic time of every log
+        self.requests = 0
+        self.failures = 0
+        self.runner = None
+        self.url = None
+
+    def add_logs(self, count: int):
+        now = time.monotonic()
+        for _ in range(count):
+            seq = len(self.logs)
+            level = 'ERROR' if seq % 10 == 0 else 'INFO'
+            self.logs.append({
+                'id': f'{self.index}-{seq}',
+                'level': level,
+                'message': f'bench:{self.index}:{seq} request handled in {random.randint(1, 500)}ms',
+                'tags': ['bench', f'project{self.index}'],
+                'extra': {'seq': seq, 'user_id': random.randint(1, 10000)},
+                'timestamp': datetime.now().isoformat()
+            })
+            self.created.append(now)
+
+    async def handle_logs(self, request: web.Request):
+        self.requests += 1
+        await asyncio.sleep(max(self.latency + random.uniform(-self.jitter, self.jitter), 0))
+        if random.random() < self.failure_rate:
+            self.failures += 1
+            return web.json_response({'detail': 'Simulated failure'}, status=500)
+
+        after = int(request.query.get('cursor') or 0)
+        limit = int(request.query.get('limit', 50))
+        logs = self.logs[after:after + limit]
+        return web.json_response({
+            'logs': logs,
+            'next_cursor': str(after + len(logs)),
+            'has_more': after + len(logs) < len(self.logs)
+        })
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/logs', self.handle_logs)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{self.runner.addresses[0][1]}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class FakeTelegramClient:
+    """Records Sends (Optional Flood Limit Per Chat -> FloodWaitError)"""
+
+    def __init__(self, flood_rate: float = 0.0, send_latency: float = 0.0):
+        self.flood_rate = flood_rate
+        self.send_latency = send_latency
+        self.chat_windows = {}  # chat_id -> (window start, sends in window)
+        self.messages = 0
+        self.flood_waits = 0
+        self.delivered = {}  # (project, seq) -> monotonic time
+
+    async def send_message(self, chat_id: int, message: str, **kwargs):
+        if self.send_latency:
+            await asyncio.sleep(self.send_latency)
+        if self.flood_rate:
+            now = time.monotonic()
+            start, sends = self.chat_windows.get(chat_id, (now, 0))
+            if now - start >= 1:
+                start, sends = now, 0
+            if sends >= self.flood_rate:
+                self.flood_waits += 1
+                raise errors.FloodWaitError(request=None, capture=1)
+            self.chat_windows[chat_id] = (start, sends + 1)
+
+        now = time.monotonic()
+        self.messages += 1
+        for project, seq in TOKEN_PATTERN.findall(message):
+            self.delivered.setdefault((int(project), int(seq)), now)
+
+
+def percentile(values: list, percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))]
+
+
+async def sample_memory(process: psutil.Process, samples: list):
+    while True:
+        samples.append(process.memory_info().rss)
+        await asyncio.sleep(0.1)
+
+
+async def run_benchmark(args) -> dict:
+    """Start Fake APIs + Bot, Run Check Cycles Until Every Log Is Delivered (Or Timeout)"""
+    # Bot settings (before the bot is created)
+    send_rate = args.send_rate or 1e9
+    LogGram.GLOBAL_SEND_RATE = send_rate
+    LogGram.PRIVATE_CHAT_SEND_RATE = send_rate
+    LogGram.GROUP_CHAT_SEND_RATE = send_rate
+    LogGram.BATCH_DELIVERY = args.batch
+    LogGram.GROUP_REPEATS = False
+    LogGram.MAX_CONCURRENT_FETCHES = args.concurrency
+    LogGram.API_HASH = LogGram.API_HASH or 'bench'  # Never connects
+
+    process = psutil.Process()
+    memory = [process.memory_info().rss]
+    sampler = asyncio.create_task(sample_memory(process, memory))
+
+    apis = [FakeProjectAPI(i, args.latency / 1000, args.jitter / 1000, args.failure_rate) for i in range(args.projects)]
+    for api in apis:
+        await api.start()
+        api.add_logs(args.logs)
+
+    bot = LogGram.TelegramLoggerBot()
+    bot.client = FakeTelegramClient(args.flood_rate, args.send_latency / 1000)
+    bot.maintenance_task = asyncio.create_task(bot.storage_maintenance())
+    for api in apis:
+        await bot.add_project(f'bench{api.index}', api.url, 1000 + api.index % args.chats)
+
+    # Producers (--rate logs per second per project, for --duration seconds)
+    async def produce(api: FakeProjectAPI):
+        produced, started = 0, time.monotonic()
+        while time.monotonic() - started < args.duration:
+            await asyncio.sleep(0.05)
+            due = int(args.rate * (time.monotonic() - started)) - produced
+            api.add_logs(due)
+            produced += due
+
+    producers = [asyncio.create_task(produce(api)) for api in apis] if args.rate else []
+
+    started = time.monotonic()
+    cycle_times = []
+    deadline = started + args.timeout
+    while time.monotonic() < deadline:
+        cycle_start = time.perf_counter()
+        await bot.check_all_projects()
+        cycle_times.append(time.perf_counter() - cycle_start)
+
+        produced = sum(len(api.logs) for api in apis)
+        if all(task.done() for task in producers) and len(bot.client.delivered) >= produced:
+            break
+        await asyncio.sleep(args.interval)
+
+    # Drain delivery queues
+    try:
+        await asyncio.wait_for(asyncio.gather(*(q.join() for q in bot.chat_queues.values())),
+                               max(deadline - time.monotonic(), 0.1))
+    except asyncio.TimeoutError:
+        pass
+    finished = time.monotonic()
+
+    for task in producers:
+        task.cancel()
+    sampler.cancel()
+    memory.append(process.memory_info().rss)
+    await bot.close()
+    for api in apis:
+        await api.stop()
+
+    client = bot.client
+    latencies = [(sent - apis[project].created[seq]) * 1000 for (project, seq), sent in client.delivered.items()]
+    produced = sum(len(api.logs) for api in apis)
+    last_delivery = max(client.delivered.values(), default=finished)
+    elapsed = max(last_delivery - started, 1e-9)
+    return {
+        'config': vars(args),
+        'results': {
+            'logs_produced': produced,
+            'logs_delivered': len(client.delivered),
+            'messages_sent': client.messages,
+            'elapsed_s': round(elapsed, 3),
+            'logs_per_s': round(len(client.delivered) / elapsed, 1),
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50), 1),
+                'p90': round(percentile(latencies, 90), 1),
+                'p99': round(percentile(latencies, 99), 1),
+                'max': round(max(latencies, default=0), 1)
+            },
+            'cycle_s': {
+                'count': len(cycle_times),
+                'mean': round(sum(cycle_times) / len(cycle_times), 3) if cycle_times else 0,
+                'max': round(max(cycle_times, default=0), 3)
+            },
+            'memory_mb': {
+                'start': round(memory[0] / 1024 ** 2, 1),
+                'peak': round(max(memory) / 1024 ** 2, 1),
+                'end': round(memory[-1] / 1024 ** 2, 1)
+            },
+            'phases_ms': {phase: round(samples.mean() * 1000, 2) for phase, samples in bot.perf.phases.items()},
+            'send_wait_p99_ms': round(bot.perf.send_waits.percentile(99) * 1000, 1),
+            'api_requests': sum(api.requests for api in apis),
+            'api_failures': sum(api.failures for api in apis),
+            'flood_waits': client.flood_waits
+        }
+    }
+
+
+def print_report(report: dict):
+    results = report['results']
+    print(f"Delivered {results['logs_delivered']}/{results['logs_produced']} logs "
+          f"in {results['messages_sent']} messages, {results['elapsed_s']}s")
+    print(f"Throughput: {results['logs_per_s']} logs/s")
+    latency = results['latency_ms']
+    print(f"Latency (ms): p50 {latency['p50']}  p90 {latency['p90']}  p99 {latency['p99']}  max {latency['max']}")
+    cycle = results['cycle_s']
+    print(f"Check cycles: {cycle['count']}  mean {cycle['mean']}s  max {cycle['max']}s")
+    print("Phases (mean ms per page): " + "  ".join(f"{phase} {value}" for phase, value in results['phases_ms'].items()))
+    memory = results['memory_mb']
+    print(f"Memory (MB): start {memory['start']}  peak {memory['peak']}  end {memory['end']}")
+    print(f"API requests: {results['api_requests']} ({results['api_failures']} failed)  "
+          f"Flood waits: {results['flood_waits']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end TelegramLoggerBot benchmark")
+    parser.add_argument('--projects', type=int, default=10, help="Fake project APIs")
+    parser.add_argument('--logs', type=int, default=200, help="Logs waiting in every project at start")
+    parser.add_argument('--rate', type=float, default=0, help="New logs per second per project during --duration")
+    parser.add_argument('--duration', type=float, default=10, help="Seconds of --rate production")
+    parser.add_argument('--latency', type=float, default=20, help="API response latency (ms)")
+    parser.add_argument('--jitter', type=float, default=5, help="Random +/- latency (ms)")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Share of API requests answered with 500")
+    parser.add_argument('--chats', type=int, default=5, help="Telegram chats (projects are spread over them)")
+    parser.add_argument('--send-rate', type=float, default=0, help="Bot send limit per chat / s (0 == unlimited)")
+    parser.add_argument('--send-latency', type=float, default=0, help="Fake Telegram latency per send (ms)")
+    parser.add_argument('--flood-rate', type=float, default=0, help="Fake FloodWait above this many sends per chat / s")
+    parser.add_argument('--concurrency', type=int, default=LogGram.MAX_CONCURRENT_FETCHES, help="Concurrent fetches")
+    parser.add_argument('--batch', action='store_true', help="BATCH_DELIVERY (many logs per message)")
+    parser.add_argument('--interval', type=float, default=0.2, help="Seconds between check cycles")
+    parser.add_argument('--timeout', type=float, default=120, help="Stop after this many seconds")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    parser.add_argument('--output', help="Also write the JSON report to this file")
+    parser.add_argument('--verbose', action='store_true', help="Bot logs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+    logging.getLogger(LogGram.__name__).setLevel(logging.INFO if args.verbose else logging.CRITICAL)
+
+    # Bot database / session files go to a temporary directory
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='benchbot-') as workdir:
+        os.chdir(workdir)
+        try:
+            report = asyncio.run(run_benchmark(args))
+        finally:
+            os.chdir(cwd)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+# BenchIngest.py - Ingest Load Test (POST /logs + ProjectLogger, With Mixed Reads)
+#
+#   python BenchIngest.py --path http --processes 4 --threads 8 --rate 2000 --duration 30
+#   python BenchIngest.py --path both --rate 0 --reads 20 --json --output bench_ingest.json
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import sqlite3
+from collections import Counter
+import requests
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_NAME = 'bench'
+LOCKED_ERROR = 'database is locked'
+
+WORDS = ['user', 'order', 'payment', 'cache', 'request', 'session', 'worker', 'queue', 'timeout', 'retry',
+         'database', 'upload', 'token', 'invoice', 'report', 'email', 'sync', 'import', 'export', 'job']
+TAGS = ['api', 'db', 'auth', 'billing', 'worker', 'cron', 'cache', 'email', 'payments', 'search']
+LEVELS = ['INFO'] * 60 + ['DEBUG'] * 20 + ['SUCCESS'] * 8 + ['WARNING'] * 8 + ['ERROR'] * 4
+
+
+def make_traceback() -> str:
+    """Realistic Stack Trace (~1-3 KB)"""
+    frames = []
+    for depth in range(random.randint(6, 20)):
+        module = random.choice(WORDS)
+        frames.append(f'  File "/srv/app/{module}/{random.choice(WORDS)}.py", line {random.randint(10, 900)}, '
+                      f'in {random.choice(WORDS)}_{random.choice(WORDS)}\n'
+                      f'    result = self.{random.choice(WORDS)}.handle(request, retries={depth})')
+    return ("Traceback (most recent call last):\n" + "\n".join(frames) +
+            f"\nValueError: Illegal {random.choice(WORDS)} id: {random.randint(1, 10 ** 6)}")
+
+
+def make_payload() -> dict:
+    """One Log Like Real Projects Send (Mostly Small, Some Large extra / Stack Traces)"""
+    level = random.choice(LEVELS)
+    message = (f"{random.choice(WORDS).title()} {random.choice(WORDS)} "
+               f"{random.randint(1, 10 ** 6)} handled in {random.randint(1, 2000)}ms")
+    extra = {'user_id': random.randint(1, 10 ** 5), 'request_id': f'{random.getrandbits(64):016x}'}
+    roll = random.random()
+    if level == 'ERROR' or roll < 0.03:
+        extra['traceback'] = make_traceback()
+    elif roll < 0.13:  # Large extra (~2-8 KB)
+        extra['items'] = [{'sku': random.randint(1, 10 ** 5), 'name': ' '.join(random.choices(WORDS, k=6)),
+                           'price': round(random.uniform(1, 500), 2)} for _ in range(random.randint(20, 80))]
+    return {
+        'level': level,
+        'message': message,
+        'tags': random.sample(TAGS, random.randint(0, 4)),
+        'extra': extra
+    }
+
+
+def percentiles(values: list) -> dict:
+    """Milliseconds"""
+    if not values:
+        return {'count': 0, 'p50': 0, 'p99': 0, 'p999': 0, 'max': 0}
+    values = sorted(values)
+
+    def at(percent):
+        return round(values[min(len(values) - 1, int(percent / 100 * len(values)))] * 1000, 2)
+    return {'count': len(values), 'p50': at(50), 'p99': at(99), 'p999': at(99.9),
+            'max': round(values[-1] * 1000, 2)}
+
+
+def ingest_worker(path: str, url: str, workdir: str, threads: int, rate: float, duration: float,
+                  seed: int, results: multiprocessing.Queue):
+    """Child Process: threads x (POST /logs | ProjectLogger) At rate / s (0 == As Fast As Possible)"""
+    random.seed(seed)
+    if path == 'direct':  # Same database file as the server
+        os.chdir(workdir)
+        os.environ['PROJECT_NAME'] = PROJECT_NAME
+        sys.path.insert(0, REPO_DIR)
+        from logger_api import ProjectLogger
+        logger = ProjectLogger(PROJECT_NAME, buffered=False)
+    payloads = [make_payload() for _ in range(500)]  # Generated up front (not part of latency)
+
+    def run(thread_index: int, stats: dict):
+        session = requests.Session() if path == 'http' else None
+        interval = threads / rate if rate else 0
+        started = time.perf_counter()
+        scheduled = started + random.uniform(0, interval)
+        i = thread_index
+        while time.perf_counter() - started < duration:
+            if interval:  # Open loop: latency counts from the scheduled time (no coordinated omission)
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                begin = scheduled
+                scheduled += interval
+            else:
+                begin = time.perf_counter()
+
+            payload = payloads[i % len(payloads)]
+            i += threads
+            error = None
+            try:
+                if session is not None:
+                    response = session.post(f"{url}/logs", json=payload, timeout=30)
+                    if response.status_code != 200:
+                        error = response.text
+                else:
+                    logger.log(payload['level'], payload['message'], payload['tags'], **payload['extra'])
+            except Exception as e:
+                error = str(e)
+
+            if error is None:
+                stats['latencies'].append(time.perf_counter() - begin)
+            else:
+                stats['errors'][error[:120]] += 1
+                if LOCKED_ERROR in error:
+                    stats['locked'] += 1
+
+    all_stats = [{'latencies': [], 'errors': Counter(), 'locked': 0} for _ in range(threads)]
+    workers = [threading.Thread(target=run, args=(index, stats)) for index, stats in enumerate(all_stats)]
+    try:
+        started = time.time()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        results.put({
+            'path': path,
+            'started': started,
+            'finished': time.time(),
+            'latencies': [value for stats in all_stats for value in stats['latencies']],
+            'errors': sum((stats['errors'] for stats in all_stats), Counter()),
+            'locked': sum(stats['locked'] for stats in all_stats)
+        })
+    except Exception:
+        results.put({'path': path, 'latencies': [], 'errors': Counter(), 'locked': 0,
+                     'crash': traceback.format_exc()})
+
+
+def read_worker(url: str, rate: float, stop: threading.Event, stats: dict):
+    """GET /logs + /stats (Bot-Like Paging, Dashboards)"""
+    session = requests.Session()
+    while not stop.is_set():
+        endpoint = random.choice(['logs', 'logs', 'stats'])
+        params = {'limit': 100, 'order': 'desc'} if endpoint == 'logs' else None
+        begin = time.perf_counter()
+        try:
+            response = session.get(f"{url}/{endpoint}", params=params, timeout=30)
+            ok = response.status_code == 200
+            text = '' if ok else response.text
+        except Exception as e:
+            ok, text = False, str(e)
+        if ok:
+            stats[endpoint].append(time.perf_counter() - begin)
+        else:
+            stats['errors'] += 1
+            if LOCKED_ERROR in text:
+                stats['locked'] += 1
+        if rate:
+            stop.wait(1 / rate)
+
+
+def database_size(workdir: str, checkpoint: bool = True) -> int:
+    """Database File Bytes (After Moving The WAL Into It) Or WAL Bytes"""
+    path = os.path.join(workdir, f'{PROJECT_NAME}_logs.db')
+    if not checkpoint:
+        return os.path.getsize(path + '-wal') if os.path.exists(path + '-wal') else 0
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    return os.path.getsize(path)
+
+
+def start_server(workdir: str, port: int, workers: int = 1) -> subprocess.Popen:
+    """logger_api Under uvicorn (Extra Settings: Environment, e.g. LOG_COMPRESS_MIN_BYTES)"""
+    env = dict(os.environ, PROJECT_NAME=PROJECT_NAME,
+               PYTHONPATH=os.pathsep.join(filter(None, [REPO_DIR, os.environ.get('PYTHONPATH')])))
+    if workers > 1:  # API_WORKERS: uvicorn workers + single writer process (output: server.log)
+        env.update(API_PORT=str(port), API_WORKERS=str(workers))
+        with open(os.path.join(workdir, 'server.log'), 'w') as log_file:
+            server = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, 'logger_api.py')], cwd=workdir,
+                                      env=env, stdout=log_file, stderr=subprocess.STDOUT)
+    else:
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'logger_api:app', '--host', '127.0.0.1', '--port', str(port),
+             '--log-level', 'warning', '--no-access-log'], cwd=workdir, env=env)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        try:
+            if requests.get(f"{url}/health", timeout=1).status_code == 200:
+                return server
+        except requests.ConnectionError:
+            pass
+        if server.poll() is not None:
+            break
+        time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("logger_api did not start")
+
+
+def run_benchmark(args, workdir: str) -> dict:
+    server = start_server(workdir, args.port, args.workers)
+    url = f"http://127.0.0.1:{args.port}"
+    try:
+        size_before = database_size(workdir)
+        paths = ['http', 'direct'] if args.path == 'both' else [args.path]
+        processes = args.processes * len(paths)
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=ingest_worker, args=(
+                path, url, workdir, args.threads, args.rate / processes, args.duration,
+                args.seed + index * len(paths) + offset, results))
+            for offset, path in enumerate(paths) for index in range(args.processes)
+        ]
+
+        stop = threading.Event()
+        read_stats = {'logs': [], 'stats': [], 'errors': 0, 'locked': 0}
+        readers = [threading.Thread(target=read_worker, args=(url, args.read_rate, stop, read_stats), daemon=True)
+                   for _ in range(args.reads)]
+
+        for worker in workers + readers:
+            worker.start()
+        collected = [results.get() for _ in workers]  # Before join (large queues)
+        for worker in workers:
+            worker.join()
+        stop.set()
+        for reader in readers:
+            reader.join(timeout=30)
+        wal_size = database_size(workdir, checkpoint=False)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    growth = database_size(workdir) - size_before
+
+    crashes = [result['crash'] for result in collected if result.get('crash')]
+    for crash in crashes:
+        print(crash, file=sys.stderr)
+
+    def window(results: list) -> float:
+        """Seconds Writers Were Running (Without Process Start / Imports)"""
+        results = [result for result in results if 'started' in result]
+        if not results:
+            return 1e-9
+        return max(max(result['finished'] for result in results) - min(result['started'] for result in results), 1e-9)
+    elapsed = window(collected)
+
+    ingest = {}
+    for path in paths:
+        path_results = [result for result in collected if result['path'] == path]
+        latencies = [value for result in path_results for value in result['latencies']]
+        errors = sum((result['errors'] for result in path_results), Counter())
+        ingest[path] = {
+            'logs': len(latencies),
+            'rate': round(len(latencies) / window(path_results), 1),
+            'latency_ms': percentiles(latencies),
+            'errors': sum(errors.values()),
+            'locked_errors': sum(result['locked'] for result in path_results),
+            'top_errors': dict(errors.most_common(3))
+        }
+
+    total_logs = sum(path['logs'] for path in ingest.values())
+    return {
+        'config': vars(args),
+        'results': {
+            'elapsed_s': round(elapsed, 3),
+            'target_rate': args.rate or None,
+            'achieved_rate': round(total_logs / elapsed, 1),
+            'ingest': ingest,
+            'reads': {
+                'logs_ms': percentiles(read_stats['logs']),
+                'stats_ms': percentiles(read_stats['stats']),
+                'errors': read_stats['errors'],
+                'locked_errors': read_stats['locked']
+            },
+            'db_growth': {
+                'bytes': growth,
+                'wal_bytes': wal_size,
+                'mb_per_million_logs': round(growth / total_logs * 10 ** 6 / 1024 ** 2, 1) if total_logs else None
+            },
+            'crashed_workers': len(crashes)
+        }
+    }
+
+
+def print_report(report: dict):
+    results = report['results']
+    print(f"Elapsed: {results['elapsed_s']}s  Achieved: {results['achieved_rate']} logs/s "
+          f"(target: {results['target_rate'] or 'max'})")
+    for path, stats in results['ingest'].items():
+        latency = stats['latency_ms']
+        print(f"Ingest {path}: {stats['logs']} logs, {stats['rate']} logs/s  "
+              f"p50 {latency['p50']}ms  p99 {latency['p99']}ms  p999 {latency['p999']}ms  max {latency['max']}ms  "
+              f"errors {stats['errors']} (locked {stats['locked_errors']})")
+        for error, count in stats['top_errors'].items():
+            print(f"  {count} x {error}")
+    reads = results['reads']
+    for endpoint in ('logs', 'stats'):
+        latency = reads[f'{endpoint}_ms']
+        print(f"Read /{endpoint}: {latency['count']} requests  p50 {latency['p50']}ms  p99 {latency['p99']}ms  "
+              f"p999 {latency['p999']}ms")
+    print(f"Read errors: {reads['errors']} (locked {reads['locked_errors']})")
+    growth = results['db_growth']
+    print(f"DB growth: {growth['bytes'] / 1024 ** 2:.1f} MB ({growth['mb_per_million_logs']} MB per million logs, "
+          f"WAL {growth['wal_bytes'] / 1024 ** 2:.1f} MB before checkpoint)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="logger_api ingest load test")
+    parser.add_argument('--path', choices=['http', 'direct', 'both'], default='http',
+                        help="POST /logs, ProjectLogger (same database file) or both at once")
+    parser.add_argument('--processes', type=int, default=2, help="Writer processes (per path)")
+    parser.add_argument('--threads', type=int, default=4, help="Writer threads per process")
+    parser.add_argument('--rate', type=float, default=500, help="Target logs / s over all writers (0 == max)")
+    parser.add_argument('--duration', type=float, default=10, help="Seconds")
+    parser.add_argument('--reads', type=int, default=2, help="Reader threads (GET /logs, /stats)")
+    parser.add_argument('--read-rate', type=float, default=10, help="Requests / s per reader (0 == max)")
+    parser.add_argument('--workers', type=int, default=1, help="API_WORKERS of the API (> 1: single writer process)")
+    parser.add_argument('--port', type=int, default=8191)
+    parser.add_argument('--workdir', help="Keep the database here (default: temporary directory)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    parser.add_argument('--output', help="Also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        report = run_benchmark(args, os.path.abspath(args.workdir))
+    else:
+        with tempfile.TemporaryDirectory(prefix='benchingest-') as workdir:
+            report = run_benchmark(args, workdir)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,24 @@
 import asyncio
 import sqlite3
 import json
+import time
+import hashlib
+import heapq
+import re
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from telethon import TelegramClient, events, Button
+from telethon import TelegramClient, events, Button, errors
 import aiohttp
+from aiohttp import web
 import logging
 import config
 
+try:  # Optional: smaller / faster /logs responses
+    import msgpack
+except ImportError:
+    msgpack = None
+
 # Main Config
 API_ID = config.API_ID  # From my.telegram.org
 API_HASH = config.API_HASH
@@ -21,11 +33,87 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+BOT_DATABASE_PATH = 'logger_bot.db'
+PAGE_SIZE = 100  # Logs per request (API maximum)
+MAX_PAGES_PER_CHECK = 50  # Pages read from one project in one check
+MAX_CONCURRENT_FETCHES = getattr(config, 'MAX_CONCURRENT_FETCHES', 10)  # Projects fetched at the same time
+
+# Polling Schedule (Per Project, Seconds)
+POLL_MIN_INTERVAL = getattr(config, 'POLL_MIN_INTERVAL', 60)  # Busy projects
+POLL_MAX_INTERVAL = getattr(config, 'POLL_MAX_INTERVAL', 3600)  # Quiet / failing projects
+POLL_START_INTERVAL = 300
+POLL_SPEEDUP = 4  # Interval / 4 after a full page or ERROR / CRITICAL logs (x2 when quiet)
+URGENT_LEVELS = ('ERROR', 'CRITICAL')
+LEVELS = ['DEBUG', 'INFO', 'SUCCESS', 'WARNING', 'ERROR', 'CRITICAL']  # Severity order (== API)
+
+# Telegram Rate Limits (Messages Per Second)
+GLOBAL_SEND_RATE = getattr(config, 'GLOBAL_SEND_RATE', 30)  # All chats
+PRIVATE_CHAT_SEND_RATE = getattr(config, 'PRIVATE_CHAT_SEND_RATE', 1)  # One user
+GROUP_CHAT_SEND_RATE = getattr(config, 'GROUP_CHAT_SEND_RATE', 20 / 60)  # One group / channel
+GROUP_CHAT_BURST = 3
+SEND_RETRY_MAX_DELAY = 300  # Seconds (Backoff for network errors)
+
+# Duplicate Check (sent_logs)
+DEDUP_CACHE_SIZE = getattr(config, 'DEDUP_CACHE_SIZE', 100000)  # Recently sent logs kept in memory
+DEDUP_BLOOM = getattr(config, 'DEDUP_BLOOM', True)  # Bloom filter for everything in sent_logs
+DEDUP_BLOOM_BITS = 8 * 1024 * 1024
+DEDUP_BLOOM_HASHES = 7
+SENT_FLUSH_SIZE = 500  # Save sent logs / last checks in batches of this size ...
+SENT_FLUSH_INTERVAL = 5  # ... or every this many seconds
+SENT_LOGS_RETENTION_DAYS = getattr(config, 'SENT_LOGS_RETENTION_DAYS', 7)
+SENT_LOGS_PRUNE_INTERVAL = 24 * 3600
+
+# Streaming (/logs/stream Instead Of Hourly Polling)
+STREAMING = getattr(config, 'STREAMING', False)
+STREAM_READ_TIMEOUT = 60  # Seconds without data (server sends a heartbeat every 15s)
+STREAM_RECONNECT_MAX_DELAY = 60
+
+# Batch Delivery (Many Logs In One Message)
+BATCH_DELIVERY = getattr(config, 'BATCH_DELIVERY', False)
+BATCH_WINDOW = getattr(config, 'BATCH_WINDOW', 2.0)  # Seconds to wait for more logs before sending
+BATCH_MAX_LOGS = getattr(config, 'BATCH_MAX_LOGS', 50)  # Logs collected for one send
+MAX_MESSAGE_LENGTH = 4096  # Telegram limit
+COMPACT_EXTRA_LENGTH = 200
+SEARCH_RESULTS = 10  # /search
+
+# Repeated Logs (One Message Per Issue + "×N more" Updates)
+GROUP_REPEATS = getattr(config, 'GROUP_REPEATS', False)
+REPEAT_UPDATE_INTERVAL = getattr(config, 'REPEAT_UPDATE_INTERVAL', 300)  # Seconds between "×N more" messages
+REPEAT_EXPIRE = 3600  # An issue quiet for this long is sent in full again
+REPEAT_CACHE_SIZE = 10000
+TEMPLATE_PATTERNS = [  # == API (logs without fingerprint)
+    (re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'), '<uuid>'),
+    (re.compile(r'(?:[A-Za-z]:)?(?:[\\/][\w.\-]+){2,}[\\/]?'), '<path>'),
+    (re.compile(r'\b0x[0-9a-fA-F]+\b|\b[0-9a-fA-F]{16,}\b'), '<hex>'),
+    (re.compile(r'\d+(?:\.\d+)?'), '<n>'),
+]
+
+# HTTP (One Shared Session)
+HTTP_TIMEOUT = 30
+HTTP_POOL_SIZE = getattr(config, 'HTTP_POOL_SIZE', 100)  # Open connections (all projects)
+HTTP_LIMIT_PER_HOST = getattr(config, 'HTTP_LIMIT_PER_HOST', 4)  # Open connections per project API
+HTTP_DNS_CACHE_TTL = 300
+HTTP_KEEPALIVE_TIMEOUT = 60
+WIRE_FORMAT = 'msgpack' if msgpack is not None else 'columnar'  # /logs?format= (gzip / br: aiohttp Accept-Encoding)
+
+# Self-Instrumentation (/perf, Local /metrics)
+PERF_WINDOW = 200  # Recent samples kept for percentiles
+LOOP_LAG_INTERVAL = 1.0  # Seconds between event loop lag probes
+PERF_HTTP_PORT = getattr(config, 'PERF_HTTP_PORT', None)  # 127.0.0.1:PORT/metrics (None == off)
+PERF_TOP_PROJECTS = 15  # Slowest projects shown by /perf
+
+
+def add_column(cursor, table: str, column: str, definition: str):
+    """ALTER TABLE ADD COLUMN (If Missing)"""
+    columns = [row[1] for row in cursor.execute(f'PRAGMA table_info({table})')]
+    if column not in columns:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
 
 # Initial DataBase
 def init_database():
     """Main DB"""
-    conn = sqlite3.connect('logger_bot.db')
+    conn = sqlite3.connect(BOT_DATABASE_PATH)
     cursor = conn.cursor()
 
     # Projects
@@ -42,6 +130,12 @@ def init_database():
         )
     ''')
 
+    # Migrations (Older Databases)
+    add_column(cursor, 'projects', 'log_cursor', 'TEXT')
+    add_column(cursor, 'projects', 'min_interval', 'INTEGER')
+    add_column(cursor, 'projects', 'max_interval', 'INTEGER')
+    add_column(cursor, 'projects', 'min_level', 'TEXT')
+
     # Logs
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS sent_logs (
@@ -52,37 +146,177 @@ def init_database():
             UNIQUE(project_name, log_id)
         )
     ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sent_logs_sent_at ON sent_logs(sent_at)')
 
     conn.commit()
     conn.close()
     logger.info("Database initialized")
 
 
-async def fetch_logs_from_project(project_name: str, api_url: str, last_check: str):
-    """Get Logs From Project (API)"""
+def create_http_session() -> aiohttp.ClientSession:
+    """Shared Session (Keep-Alive, DNS Cache)"""
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_SIZE,
+        limit_per_host=HTTP_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT))
+
+
+def project_filters(tags: list, min_level: str = None) -> dict:
+    """Project Tags / Severity -> /logs Filter (Level Names In Tags Are Levels)"""
+    levels = [tag.upper() for tag in tags if tag.upper() in LEVELS]
+    other_tags = [tag for tag in tags if tag.upper() not in LEVELS]
+    filters = {}
+    if levels:
+        filters['level'] = ','.join(levels)
+    if min_level:
+        filters['min_level'] = min_level
+    if other_tags:
+        filters['tags'] = ','.join(other_tags)
+    return filters
+
+
+def log_matches(filters: dict, log: dict) -> bool:
+    """Same Filter On The Bot (Older APIs Ignore It)"""
+    level = str(log.get('level', '')).upper()
+    if 'level' in filters and level not in filters['level'].split(','):
+        return False
+    if 'min_level' in filters and (level not in LEVELS or LEVELS.index(level) < LEVELS.index(filters['min_level'])):
+        return False
+    if 'tags' in filters and not set(filters['tags'].split(',')) & set(log.get('tags') or []):
+        return False
+    return True
+
+
+async def fetch_logs_from_project(project_name: str, api_url: str, last_check: str, log_cursor: str = None,
+                                  session: aiohttp.ClientSession = None, filters: dict = None, perf: dict = None):
+    """Get Logs From Project (API) -> (logs, next_cursor, has_more), perf: bytes / decode seconds / error"""
+    perf = {} if perf is None else perf
     try:
         params = {
-            'since': last_check,
-            'format': 'json'
+            'format': WIRE_FORMAT,
+            'limit': PAGE_SIZE,
+            'order': 'asc',
+            **(filters or {})
         }
+        if log_cursor:
+            params['cursor'] = log_cursor
+        else:
+            params['since'] = last_check
 
-        timeout = aiohttp.ClientTimeout(total=30)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            print(f"{api_url}/logs")
-            async with session.get(f"{api_url}/logs", params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('logs', [])
-                else:
-                    logger.error(f"Error Fetch Project: {project_name}: HTTP {response.status}")
-                    return []
+        if session is None:
+            async with create_http_session() as session:
+                return await _get_logs(session, project_name, api_url, params, log_cursor, perf)
+        return await _get_logs(session, project_name, api_url, params, log_cursor, perf)
 
     except asyncio.TimeoutError:
         logger.error(f"TiemOut Connection Project: {project_name}")
-        return []
+        perf['error'] = True
+        return [], log_cursor, False
     except Exception as e:
         logger.error(f"Error Get Logs Project: {project_name}: {str(e)}")
-        return []
+        perf['error'] = True
+        return [], log_cursor, False
+
+
+async def _get_logs(session: aiohttp.ClientSession, project_name: str, api_url: str, params: dict, log_cursor: str,
+                    perf: dict):
+    logger.debug(f"Fetching {api_url}/logs")
+    async with session.get(f"{api_url}/logs", params=params) as response:
+        if response.status == 200:
+            body = await response.read()
+            started = time.perf_counter()
+            if response.content_type == 'application/x-msgpack':
+                data = msgpack.unpackb(body)
+            else:
+                data = json.loads(body)
+            logs = decode_logs(data)
+            perf['bytes'] = len(body)
+            perf['decode'] = time.perf_counter() - started
+            return logs, data.get('next_cursor'), data.get('has_more', False)
+        else:
+            logger.error(f"Error Fetch Project: {project_name}: HTTP {response.status}")
+            perf['error'] = True
+            return [], log_cursor, False
+
+
+def decode_logs(data: dict) -> list:
+    """/logs Body -> Logs (columnar / msgpack: columns + rows, Older APIs: logs)"""
+    if 'columns' in data:
+        columns = data['columns']
+        return [dict(zip(columns, row)) for row in data.get('rows', [])]
+    return data.get('logs', [])
+
+
+class SearchNotSupportedError(Exception):
+    pass
+
+
+async def search_project_logs(session: aiohttp.ClientSession, project_name: str, api_url: str, query: str,
+                              limit: int = SEARCH_RESULTS):
+    """Full-Text Search On A Project (/logs/search) -> (logs, has_more)"""
+    async with session.get(f"{api_url}/logs/search", params={'q': query, 'limit': limit}) as response:
+        if response.status in (404, 501):
+            raise SearchNotSupportedError(f"{project_name}: HTTP {response.status}")
+        response.raise_for_status()
+        data = await response.json()
+        return data.get('logs', []), data.get('has_more', False)
+
+
+# Color Emoji
+EMOJI_MAP = {
+    'ERROR': '🔴',
+    'CRITICAL': '💥',
+    'WARNING': '🟡',
+    'INFO': '🔵',
+    'DEBUG': '🟣',
+    'SUCCESS': '🟢'
+}
+
+
+class StreamNotSupportedError(Exception):
+    pass
+
+
+async def stream_logs_from_project(session: aiohttp.ClientSession, project_name: str, api_url: str,
+                                   log_cursor: str = None, filters: dict = None):
+    """Subscribe To /logs/stream (SSE) -> Yields (log, cursor)"""
+    params = dict(filters or {})
+    if log_cursor:
+        params['cursor'] = log_cursor
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=STREAM_READ_TIMEOUT)
+    logger.debug(f"Streaming {api_url}/logs/stream")
+    async with session.get(f"{api_url}/logs/stream", params=params, timeout=timeout,
+                           headers={'Accept': 'text/event-stream'}) as response:
+        if response.status in (404, 405):
+            raise StreamNotSupportedError(f"{project_name}: HTTP {response.status}")
+        response.raise_for_status()
+
+        buffer = b""
+        event_id, event, data = None, 'message', []
+        async for chunk in response.content.iter_any():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line = line.decode('utf-8').rstrip('\r')
+                if not line:  # End of event
+                    if event == 'log' and data:
+                        yield json.loads("\n".join(data)), event_id
+                    event, data = 'message', []
+                    continue
+                if line.startswith(':'):  # Heartbeat
+                    continue
+
+                field, _, value = line.partition(':')
+                value = value[1:] if value.startswith(' ') else value
+                if field == 'id':
+                    event_id = value
+                elif field == 'event':
+                    event = value
+                elif field == 'data':
+                    data.append(value)
 
 
 async def format_log_message(project_name: str, log: dict):
@@ -92,16 +326,7 @@ async def format_log_message(project_name: str, log: dict):
     timestamp = log.get('timestamp', '')
     tags = log.get('tags', [])
 
-    # Color Emoji
-    emoji_map = {
-        'ERROR': '🔴',
-        'CRITICAL': '💥',
-        'WARNING': '🟡',
-        'INFO': '🔵',
-        'DEBUG': '🟣',
-        'SUCCESS': '🟢'
-    }
-    emoji = emoji_map.get(level, '📝')
+    emoji = EMOJI_MAP.get(level, '📝')
 
     text = f"{emoji} **{project_name}** - {level}\n\n"
     text += f"📅 **Date:** `{timestamp}`\n"
@@ -117,61 +342,498 @@ async def format_log_message(project_name: str, log: dict):
     return text
 
 
+def shorten(text: str, length: int = COMPACT_EXTRA_LENGTH) -> str:
+    return text if len(text) <= length else text[:length] + "…"
+
+
+def format_log_compact(log: dict, max_length: int = MAX_MESSAGE_LENGTH) -> str:
+    """Formater (One Entry Of A Batch Message)"""
+    level = shorten(log.get('level', 'INFO').upper(), 16)
+    message = log.get('message', '')
+    tags = log.get('tags', [])
+
+    text = f"{EMOJI_MAP.get(level, '📝')} **{level}**"
+    if log.get('timestamp'):
+        text += f" `{shorten(str(log['timestamp']), 40)}`"
+    if tags:
+        text += f" 🏷 {shorten(', '.join(tags))}"
+
+    extra = ""
+    if log.get('extra'):
+        extra = f"\n`{shorten(json.dumps(log['extra'], ensure_ascii=False))}`"
+
+    # Header, tags and extra are capped above; the message gets the rest
+    room = max_length - len(text) - len(extra) - 9
+    if len(message) > room:
+        message = message[:max(room - 1, 0)] + "…"
+    return f"{text}\n```\n{message}\n```{extra}"
+
+
+def pack_log_messages(entries: list, max_length: int = MAX_MESSAGE_LENGTH) -> list:
+    """[(project_name, log)] -> [(text, entries)] (Few Messages, Each <= max_length)"""
+    messages = []
+    text, packed, current_project = "", [], None
+    for project_name, log in entries:
+        header = f"📦 **{shorten(project_name, 64)}**\n\n"
+        entry = format_log_compact(log, max_length - len(header))
+
+        part = entry if project_name == current_project else header + entry
+        if packed and len(text) + 2 + len(part) > max_length:
+            messages.append((text, packed))
+            text, packed = "", []
+            part = header + entry
+        text = f"{text}\n\n{part}" if text else part
+        assert len(text) <= max_length, len(text)
+        packed.append((project_name, log))
+        current_project = project_name
+
+    if packed:
+        messages.append((text, packed))
+    return messages
+
+
+def format_search_results(project_name: str, query: str, logs: list, has_more: bool = False,
+                          max_length: int = MAX_MESSAGE_LENGTH) -> str:
+    """Formater (/search, Matched Words In Bold)"""
+    text = f"🔎 **{project_name}:** `{query}`\n\n"
+    if not logs:
+        return text + "نتیجه‌ای یافت نشد 📝"
+
+    for log in logs:
+        level = log.get('level', 'INFO').upper()
+        entry = f"{EMOJI_MAP.get(level, '📝')} **{level}** `{log.get('timestamp', '')}`\n"
+        entry += f"{log.get('snippet') or log.get('message', '')[:COMPACT_EXTRA_LENGTH]}\n\n"
+        if len(text) + len(entry) > max_length - 10:
+            has_more = True
+            break
+        text += entry
+
+    if has_more:
+        text += "…"
+    return text
+
+
+def message_template(message: str) -> str:
+    for pattern, mask in TEMPLATE_PATTERNS:
+        message = pattern.sub(mask, message)
+    return message
+
+
+def log_fingerprint(log: dict) -> str:
+    """Fingerprint From The API, Or The Same Hash Computed Here"""
+    if log.get('fingerprint'):
+        return log['fingerprint']
+    tags = ','.join(sorted(set(log.get('tags') or [])))
+    key = f"{str(log.get('level', '')).upper()}\x00{message_template(str(log.get('message', '')))}\x00{tags}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def format_repeat_message(project_name: str, log: dict, repeats: int, total: int) -> str:
+    """Formater (×N more)"""
+    level = log.get('level', 'INFO').upper()
+    template = message_template(log.get('message', ''))
+    if len(template) > COMPACT_EXTRA_LENGTH:
+        template = template[:COMPACT_EXTRA_LENGTH] + "…"
+    return (f"🔁 **{project_name}** - {level} ×{repeats} more (total: {total})\n"
+            f"```\n{template}\n```")
+
+
+def sent_log_key(project_name: str, log: dict) -> tuple:
+    return project_name, log.get('id', f"{project_name}_{log.get('timestamp', '')}")
+
+
+class BloomFilter:
+    """Bloom Filter (No False Negatives)"""
+
+    def __init__(self, bits: int = DEDUP_BLOOM_BITS, hashes: int = DEDUP_BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray(bits // 8 + 1)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.array[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class SentLogIndex:
+    """Sent Logs In Memory (LRU + Optional Bloom Filter In Front Of sent_logs)"""
+
+    def __init__(self, size: int = DEDUP_CACHE_SIZE, bloom: bool = DEDUP_BLOOM):
+        self.size = size
+        self.recent = OrderedDict()
+        self.bloom = BloomFilter() if bloom else None
+
+    def add(self, key: tuple):
+        self.recent[key] = None
+        self.recent.move_to_end(key)
+        if len(self.recent) > self.size:
+            self.recent.popitem(last=False)
+        if self.bloom is not None:
+            self.bloom.add('\x1f'.join(key))
+
+    def seen(self, key: tuple):
+        """True / False / None (Bloom Filter Says Maybe -> Check sent_logs)"""
+        if key in self.recent:
+            self.recent.move_to_end(key)
+            return True
+        if self.bloom is None or '\x1f'.join(key) not in self.bloom:
+            return False
+        return None
+
+
+def build_sent_index(cursor, extra_keys=()) -> SentLogIndex:
+    """sent_logs (+ extra_keys) -> SentLogIndex"""
+    index = SentLogIndex()
+    if index.bloom is not None:
+        for key in cursor.execute('SELECT project_name, log_id FROM sent_logs'):
+            index.bloom.add('\x1f'.join(map(str, key)))
+    recent = cursor.execute('SELECT project_name, log_id FROM sent_logs ORDER BY id DESC LIMIT ?',
+                            (index.size,)).fetchall()
+    for key in reversed(recent):
+        index.recent[tuple(key)] = None
+    for key in extra_keys:
+        index.add(key)
+    return index
+
+
+class TokenBucket:
+    """Token Bucket (rate tokens per second, up to capacity)"""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """FloodWait: No Tokens Until now + seconds"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+class RateLimiter:
+    """Global + Per-Chat Token Buckets (Telegram Limits)"""
+
+    def __init__(self):
+        self.global_bucket = TokenBucket(GLOBAL_SEND_RATE, GLOBAL_SEND_RATE)
+        self.chat_buckets = {}
+
+    def chat_bucket(self, chat_id: int) -> TokenBucket:
+        if chat_id not in self.chat_buckets:
+            if chat_id < 0:  # Group / Channel
+                self.chat_buckets[chat_id] = TokenBucket(GROUP_CHAT_SEND_RATE, GROUP_CHAT_BURST)
+            else:
+                self.chat_buckets[chat_id] = TokenBucket(PRIVATE_CHAT_SEND_RATE, 1)
+        return self.chat_buckets[chat_id]
+
+    async def acquire(self, chat_id: int):
+        await self.chat_bucket(chat_id).acquire()
+        await self.global_bucket.acquire()
+
+    def flood_wait(self, chat_id: int, seconds: float):
+        self.chat_bucket(chat_id).pause(seconds)
+
+
+class Samples:
+    """Recent Values (Percentiles) + Totals"""
+
+    def __init__(self, size: int = PERF_WINDOW):
+        self.recent = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.recent.append(value)
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percent: float) -> float:
+        if not self.recent:
+            return 0.0
+        values = sorted(self.recent)
+        return values[min(len(values) - 1, int(percent / 100 * len(values)))]
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class BotPerf:
+    """Bot Counters / Timings (/perf, Local /metrics)"""
+    PHASES = {  # One page of check_project
+        'wait': 'انتظار',  # fetch_semaphore
+        'fetch': 'دریافت',  # HTTP
+        'decode': 'تبدیل',  # JSON / msgpack -> logs
+        'forward': 'صف',  # Filter, dedup, chat queue
+    }
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.projects = {}  # project_name -> fetch stats
+        self.phases = {phase: Samples() for phase in self.PHASES}
+        self.checks = Samples()  # One check_project (all pages)
+        self.due_lag = Samples()  # Scheduler: poll started this long after its due time
+        self.sends = Samples()  # client.send_message
+        self.send_waits = Samples()  # Rate limiter
+        self.loop_lag = Samples()
+        self.sent = 0
+        self.send_failed = 0
+        self.send_retries = 0
+        self.flood_waits = 0
+        self.flood_wait_seconds = 0
+
+    def project(self, project_name: str) -> dict:
+        if project_name not in self.projects:
+            self.projects[project_name] = {'fetch': Samples(), 'fetches': 0, 'errors': 0, 'logs': 0, 'bytes': 0}
+        return self.projects[project_name]
+
+    def record_fetch(self, project_name: str, seconds: float, fetch: dict, logs: int):
+        """One /logs Request (seconds Includes Decoding)"""
+        decode = fetch.get('decode', 0.0)
+        stats = self.project(project_name)
+        stats['fetch'].add(seconds)
+        stats['fetches'] += 1
+        stats['errors'] += bool(fetch.get('error'))
+        stats['logs'] += logs
+        stats['bytes'] += fetch.get('bytes', 0)
+        self.phases['fetch'].add(seconds - decode)
+        self.phases['decode'].add(decode)
+
+    async def measure_loop_lag(self):
+        """Sleep Overshoot == Time Callbacks Blocked The Event Loop"""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self.loop_lag.add(max(loop.time() - started - LOOP_LAG_INTERVAL, 0.0))
+
+    def report(self, backlog: dict) -> str:
+        """/perf Message"""
+        def ms(value: float) -> str:
+            return f"{value * 1000:.0f}"
+
+        uptime = int(time.monotonic() - self.started)
+        text = "⏱ **کارایی ربات**\n\n"
+        text += f"• زمان اجرا: {uptime // 3600}:{uptime % 3600 // 60:02d}:{uptime % 60:02d}\n"
+        text += (f"• تأخیر حلقه رویداد (ms): p50 {ms(self.loop_lag.percentile(50))} | "
+                 f"p99 {ms(self.loop_lag.percentile(99))} | max {ms(self.loop_lag.max)}\n")
+        text += (f"• چک پروژه (ms): {self.checks.count} بار | p50 {ms(self.checks.percentile(50))} | "
+                 f"p95 {ms(self.checks.percentile(95))}\n")
+        if self.due_lag.count:
+            text += (f"• تأخیر شروع چک نسبت به زمان‌بندی (ms): p50 {ms(self.due_lag.percentile(50))} | "
+                     f"p99 {ms(self.due_lag.percentile(99))} | max {ms(self.due_lag.max)}\n")
+        text += "• مراحل (میانگین ms): " + " | ".join(
+            f"{name} {ms(self.phases[phase].mean())}" for phase, name in self.PHASES.items()) + "\n"
+        text += (f"• ارسال: ✅ {self.sent} | ❌ {self.send_failed} | 🔁 {self.send_retries} | "
+                 f"⏳ FloodWait {self.flood_waits} ({self.flood_wait_seconds}s)\n")
+        text += (f"• زمان ارسال (ms): p50 {ms(self.sends.percentile(50))} | p99 {ms(self.sends.percentile(99))} | "
+                 f"انتظار محدودیت p99 {ms(self.send_waits.percentile(99))}\n")
+
+        queued = sorted(((size, chat_id) for chat_id, size in backlog.items() if size), reverse=True)
+        text += f"• صف ارسال: {sum(backlog.values())}"
+        if queued:
+            text += " (" + ", ".join(f"`{chat_id}`: {size}" for size, chat_id in queued[:5]) + ")"
+        text += "\n"
+
+        if self.projects:
+            text += "\n**پروژه‌ها (کندترین اول):**\n"
+            slowest = sorted(self.projects.items(), key=lambda item: item[1]['fetch'].percentile(95), reverse=True)
+            for project_name, stats in slowest[:PERF_TOP_PROJECTS]:
+                fetch = stats['fetch']
+                text += (f"• {project_name}: p50 {ms(fetch.percentile(50))} | p95 {ms(fetch.percentile(95))} ms | "
+                         f"{stats['fetches']} درخواست ({stats['errors']} خطا) | {stats['logs']} لاگ | "
+                         f"{stats['bytes'] / 1024:.0f} KB\n")
+        return text
+
+    def render_metrics(self, backlog: dict) -> str:
+        """Prometheus Text Format"""
+        lines = []
+
+        def labels(**pairs) -> str:
+            if not pairs:
+                return ""
+            escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for value in pairs.values())
+            return "{" + ",".join(f'{key}="{value}"' for key, value in zip(pairs, escaped)) + "}"
+
+        def metric(name: str, kind: str, help_text: str, samples: list):
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"])
+            lines.extend(f"{name}{label} {value}" for label, value in samples)
+
+        def summary(name: str, help_text: str, items: list):
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} summary"])
+            for pairs, samples in items:
+                for quantile in (0.5, 0.95, 0.99):
+                    lines.append(f"{name}{labels(**pairs, quantile=quantile)} {samples.percentile(quantile * 100)}")
+                lines.append(f"{name}_sum{labels(**pairs)} {samples.total}")
+                lines.append(f"{name}_count{labels(**pairs)} {samples.count}")
+
+        projects = list(self.projects.items())
+        summary("loggram_bot_fetch_seconds", "Project /logs request time",
+                [({'project': name}, stats['fetch']) for name, stats in projects])
+        for key, help_text in (('errors', "Failed /logs requests"), ('logs', "Logs fetched"),
+                               ('bytes', "Response bytes (decompressed)")):
+            metric(f"loggram_bot_fetch_{key}_total", "counter", help_text,
+                   [(labels(project=name), stats[key]) for name, stats in projects])
+        summary("loggram_bot_phase_seconds", "Time per check phase (one page)",
+                [({'phase': phase}, samples) for phase, samples in self.phases.items()])
+        summary("loggram_bot_check_seconds", "One project check (all pages)", [({}, self.checks)])
+        summary("loggram_bot_due_lag_seconds", "Poll start after its due time (scheduler)", [({}, self.due_lag)])
+        summary("loggram_bot_send_seconds", "Telegram send_message time", [({}, self.sends)])
+        summary("loggram_bot_send_wait_seconds", "Rate limiter wait before a send", [({}, self.send_waits)])
+        summary("loggram_bot_loop_lag_seconds", "Event loop lag", [({}, self.loop_lag)])
+        metric("loggram_bot_sends_total", "counter", "Telegram messages",
+               [(labels(result='sent'), self.sent), (labels(result='failed'), self.send_failed),
+                (labels(result='retry'), self.send_retries)])
+        metric("loggram_bot_flood_waits_total", "counter", "FloodWait errors", [("", self.flood_waits)])
+        metric("loggram_bot_flood_wait_seconds_total", "counter", "Seconds of FloodWait",
+               [("", self.flood_wait_seconds)])
+        metric("loggram_bot_delivery_backlog", "gauge", "Queued items per chat",
+               [(labels(chat_id=chat_id), size) for chat_id, size in backlog.items()])
+        return "\n".join(lines) + "\n"
+
+
+class BotStorage:
+    """logger_bot.db On One Thread (Persistent WAL Connection, Event Loop Never Waits On Disk)"""
+
+    def __init__(self, path: str = BOT_DATABASE_PATH):
+        self.path = path
+        self.conn = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='BotStorage', initializer=self._open)
+
+    def _open(self):
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+
+    def _call(self, fn, *args):
+        with self.conn:  # One transaction
+            return fn(self.conn.cursor(), *args)
+
+    async def run(self, fn, *args):
+        """fn(cursor, *args) On The Storage Thread"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self._call, fn, *args)
+
+    def run_sync(self, fn, *args):
+        """Startup Only (Blocks)"""
+        return self.executor.submit(self._call, fn, *args).result()
+
+    def close(self):
+        def close_connection():
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+        self.executor.submit(close_connection)
+        self.executor.shutdown(wait=True)
+
+
 class TelegramLoggerBot:
     def __init__(self):
         self.client = TelegramClient('logger_bot', API_ID, API_HASH)
         init_database()
+        self.storage = BotStorage()
         self.projects = {}
         self.load_projects()
         self.is_running = False
+        self.fetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        self.chat_queues = {}  # chat_id -> asyncio.Queue
+        self.chat_workers = {}  # chat_id -> Task
+        self.http = None  # Shared aiohttp session (run() / get_http())
+        self.rate_limiter = RateLimiter()
+        self.sent_index = self.storage.run_sync(build_sent_index)
+        self.pending_sent = []  # Sent logs not saved in sent_logs yet
+        self.pending_checks = {}  # project_name -> (last_check, log_cursor) not saved yet
+        self.flush_event = asyncio.Event()
+        self.maintenance_task = None
+        self.repeats = OrderedDict()  # (project_name, fingerprint) -> Issue sent (GROUP_REPEATS)
+        self.repeat_task = None
+        self.streams = {}  # project_name -> Task (STREAMING)
+        self.schedule = []  # Heap of (next_due, project_name)
+        self.schedule_event = asyncio.Event()
+        self.polls = {}  # project_name -> Task (Running check)
+        self.perf = BotPerf()
+        self.lag_task = None
+        self.perf_server = None  # aiohttp AppRunner (PERF_HTTP_PORT)
 
     def load_projects(self):
         """Loading Projects"""
-        conn = sqlite3.connect('logger_bot.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM projects WHERE active = 1')
+        def select(cursor):
+            cursor.execute('SELECT * FROM projects WHERE active = 1')
+            return cursor.fetchall()
 
         self.projects = {}
-        for row in cursor.fetchall():
+        for row in self.storage.run_sync(select):
             self.projects[row[1]] = {
                 'id': row[0],
                 'api_url': row[2],
                 'chat_id': row[3],
                 'tags': row[4].split(',') if row[4] else [],
-                'last_check': row[5]
+                'last_check': row[5],
+                'log_cursor': row[8],
+                'min_interval': row[9],
+                'max_interval': row[10],
+                'min_level': row[11]
             }
-        conn.close()
         logger.info(f"{len(self.projects)} Loaded Projects")
 
-    async def add_project(self, name: str, api_url: str, chat_id: int, tags: str = ""):
+    async def add_project(self, name: str, api_url: str, chat_id: int, tags: str = "",
+                          min_interval: int = None, max_interval: int = None, min_level: str = None):
         """Add New Project"""
-        conn = sqlite3.connect('logger_bot.db')
-        cursor = conn.cursor()
-
-        try:
+        def insert(cursor):
             cursor.execute('''
-                INSERT INTO projects (name, api_url, chat_id, tags)
-                VALUES (?, ?, ?, ?)
-            ''', (name, api_url, chat_id, tags))
-            conn.commit()
+                INSERT INTO projects (name, api_url, chat_id, tags, min_interval, max_interval, min_level)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (name, api_url, chat_id, tags, min_interval, max_interval, min_level))
+            return cursor.lastrowid
 
-            project_id = cursor.lastrowid
+        try:
+            project_id = await self.storage.run(insert)
             self.projects[name] = {
                 'id': project_id,
                 'api_url': api_url,
                 'chat_id': chat_id,
                 'tags': tags.split(',') if tags else [],
-                'last_check': datetime.now().isoformat()
+                'last_check': datetime.now().isoformat(),
+                'log_cursor': None,
+                'min_interval': min_interval,
+                'max_interval': max_interval,
+                'min_level': min_level
             }
+            if self.is_running:
+                self.schedule_project(name, 0)
 
-            conn.close()
             return True, f"پروژه '{name}' با موفقیت اضافه شد ✅"
 
         except sqlite3.IntegrityError:
-            conn.close()
             return False, f"پروژه '{name}' قبلاً وجود دارد ❌"
         except Exception as e:
-            conn.close()
             return False, f"خطا در اضافه کردن پروژه: {str(e)} ❌"
 
     async def remove_project(self, name: str):
@@ -179,13 +841,13 @@ class TelegramLoggerBot:
         if name not in self.projects:
             return False, f"پروژه '{name}' یافت نشد ❌"
 
-        conn = sqlite3.connect('logger_bot.db')
-        cursor = conn.cursor()
-        cursor.execute('UPDATE projects SET active = 0 WHERE name = ?', (name,))
-        conn.commit()
-        conn.close()
+        def deactivate(cursor):
+            cursor.execute('UPDATE projects SET active = 0 WHERE name = ?', (name,))
+
+        await self.storage.run(deactivate)
 
         del self.projects[name]
+        self.pending_checks.pop(name, None)
         return True, f"پروژه '{name}' حذف شد ✅"
 
     async def list_projects(self):
@@ -201,6 +863,9 @@ class TelegramLoggerBot:
             text += f"├ API: `{info['api_url']}`\n"
             text += f"├ چت: `{info['chat_id']}`\n"
             text += f"├ تگ‌ها: {', '.join(info['tags']) if info['tags'] else 'ندارد'}\n"
+            if info['min_level']:
+                text += f"├ حداقل سطح: {info['min_level']}\n"
+            text += f"├ بازه چک: {int(info.get('interval', POLL_START_INTERVAL))} ثانیه\n"
             text += f"└ آخرین چک: {info['last_check']}\n\n"
 
         return text
@@ -209,23 +874,133 @@ class TelegramLoggerBot:
         """Send Logs In Bot"""
         try:
             message = await format_log_message(project_name, log)
-            await self.client.send_message(chat_id, message, parse_mode='markdown')
-
-            log_id = log.get('id', f"{project_name}_{log.get('timestamp', '')}")
-            conn = sqlite3.connect('logger_bot.db')
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR IGNORE INTO sent_logs (project_name, log_id)
-                VALUES (?, ?)
-            ''', (project_name, log_id))
-            conn.commit()
-            conn.close()
+            await self.send_message(chat_id, message)
+            self.mark_sent([(project_name, log)])
 
             return True
         except Exception as e:
             logger.error(f"Error In Send Logs {project_name}: {str(e)}")
             return False
 
+    async def send_logs_batch(self, chat_id: int, entries: list):
+        """Send Many Logs In As Few Messages As Possible"""
+        for message, packed in pack_log_messages(entries):
+            try:
+                await self.send_message(chat_id, message)
+                self.mark_sent(packed)
+            except Exception as e:
+                logger.error(f"Error In Send Logs {chat_id}: {str(e)}")
+
+    async def send_message(self, chat_id: int, message: str):
+        """Send With Rate Limits (Wait On FloodWait, Retry Network Errors)"""
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            await self.rate_limiter.acquire(chat_id)
+            sending = time.perf_counter()
+            self.perf.send_waits.add(sending - started)
+            try:
+                result = await self.client.send_message(chat_id, message, parse_mode='markdown')
+                self.perf.sends.add(time.perf_counter() - sending)
+                self.perf.sent += 1
+                return result
+            except (errors.FloodWaitError, errors.SlowModeWaitError) as e:
+                logger.warning(f"FloodWait {chat_id}: {e.seconds}s")
+                self.perf.flood_waits += 1
+                self.perf.flood_wait_seconds += e.seconds
+                self.rate_limiter.flood_wait(chat_id, e.seconds)
+            except errors.RPCError as e:
+                if e.code in (400, 401, 403, 404):  # Will never succeed (bad chat, no access, ...)
+                    self.perf.send_failed += 1
+                    raise
+                self.perf.send_retries += 1
+                attempt = await self.send_backoff(chat_id, attempt, e)
+            except (ConnectionError, OSError, asyncio.TimeoutError) as e:
+                self.perf.send_retries += 1
+                attempt = await self.send_backoff(chat_id, attempt, e)
+            except Exception:
+                self.perf.send_failed += 1
+                raise
+
+    @staticmethod
+    async def send_backoff(chat_id: int, attempt: int, error: Exception) -> int:
+        delay = min(SEND_RETRY_MAX_DELAY, 2 ** attempt)
+        logger.warning(f"Error In Send {chat_id} (Retry In {delay}s): {str(error)}")
+        await asyncio.sleep(delay)
+        return attempt + 1
+
+    def delivery_backlog(self) -> dict:
+        """chat_id -> Queued Items"""
+        return {chat_id: chat_queue.qsize() for chat_id, chat_queue in self.chat_queues.items()}
+
+    def mark_sent(self, entries: list):
+        """[(project_name, log)] -> sent_logs (Batched)"""
+        self.pending_sent.extend(sent_log_key(project_name, log) for project_name, log in entries)
+        if len(self.pending_sent) >= SENT_FLUSH_SIZE:
+            self.flush_event.set()
+
+    async def flush_pending(self):
+        """Pending Sent Logs + Last Checks -> One Transaction"""
+        if not self.pending_sent and not self.pending_checks:
+            return
+        sent, self.pending_sent = self.pending_sent, []
+        checks, self.pending_checks = self.pending_checks, {}
+
+        def write(cursor):
+            cursor.executemany('''
+                INSERT OR IGNORE INTO sent_logs (project_name, log_id)
+                VALUES (?, ?)
+            ''', sent)
+            cursor.executemany('''
+                UPDATE projects SET last_check = ?, log_cursor = ? WHERE name = ?
+            ''', [(last_check, log_cursor, name) for name, (last_check, log_cursor) in checks.items()])
+
+        await self.storage.run(write)
+
+    async def is_duplicate(self, project_name: str, log: dict) -> bool:
+        """Already Sent (Or Queued)? Otherwise Remember It"""
+        key = sent_log_key(project_name, log)
+        seen = self.sent_index.seen(key)
+        if seen is None:
+            seen = await self.storage.run(lambda cursor: cursor.execute(
+                'SELECT 1 FROM sent_logs WHERE project_name = ? AND log_id = ?', key).fetchone() is not None)
+        if seen:
+            return True
+        self.sent_index.add(key)
+        return False
+
+    async def prune_sent_logs(self):
+        """Delete Old sent_logs Rows (Rebuild SentLogIndex)"""
+        recent_keys = list(self.sent_index.recent)
+
+        def prune(cursor):
+            cursor.execute("DELETE FROM sent_logs WHERE sent_at < datetime('now', ?)",
+                           (f'-{SENT_LOGS_RETENTION_DAYS} days',))
+            deleted = cursor.rowcount
+            return deleted, build_sent_index(cursor, recent_keys) if deleted else None
+
+        deleted, index = await self.storage.run(prune)
+        if index is not None:
+            self.sent_index = index
+        logger.info(f"{deleted} Old Sent Logs Deleted")
+
+    async def storage_maintenance(self):
+        """Flush Sent Logs + Last Checks / Prune sent_logs (Background)"""
+        last_prune = 0.0
+        while True:
+            try:
+                await asyncio.wait_for(self.flush_event.wait(), SENT_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self.flush_event.clear()
+            try:
+                await self.flush_pending()
+                if time.monotonic() - last_prune >= SENT_LOGS_PRUNE_INTERVAL:
+                    await self.prune_sent_logs()
+                    last_prune = time.monotonic()
+            except Exception as e:
+                logger.error(f"Error In Storage Maintenance: {str(e)}")
+
     async def check_all_projects(self):
         """Check All Projects (All Logs)"""
         if not self.projects:
@@ -233,40 +1008,270 @@ class TelegramLoggerBot:
 
         logger.info("Checking All Projects ...")
 
-        for project_name, info in self.projects.items():
-            try:
-                logs = await fetch_logs_from_project(
-                    project_name,
-                    info['api_url'],
-                    info['last_check']
-                )
+        await asyncio.gather(*(
+            self.check_project(project_name, info) for project_name, info in list(self.projects.items())
+            if project_name not in self.streams
+        ))
 
+    async def check_project(self, project_name: str, info: dict) -> dict:
+        """Fetch New Logs Of One Project -> Chat Queue (Returns Poll Stats)"""
+        stats = {'logs': 0, 'full_page': False, 'urgent': False, 'failed': False}
+        check_started = time.perf_counter()
+        try:
+            # fetch_cursor: Fetched (Queued) / log_cursor: Delivered (Saved In DB)
+            fetch_cursor = info.get('fetch_cursor', info['log_cursor'])
+            filters = project_filters(info['tags'], info['min_level'])
+            for _ in range(MAX_PAGES_PER_CHECK):
+                waiting = time.perf_counter()
+                async with self.fetch_semaphore:
+                    fetching = time.perf_counter()
+                    self.perf.phases['wait'].add(fetching - waiting)
+                    fetch = {}
+                    logs, next_cursor, has_more = await fetch_logs_from_project(
+                        project_name,
+                        info['api_url'],
+                        info['last_check'],
+                        fetch_cursor,
+                        session=self.get_http(),
+                        # Older APIs (no cursor) read level= as one level and ignore the other filters
+                        filters=filters if fetch_cursor else {k: v for k, v in filters.items() if k != 'level'},
+                        perf=fetch
+                    )
+                    self.perf.record_fetch(project_name, time.perf_counter() - fetching, fetch, len(logs))
+
+                forwarding = time.perf_counter()
                 if logs:
                     logger.info(f"{len(logs)} New Logs {project_name} Found.")
+                    stats['logs'] += len(logs)
+                    stats['full_page'] = stats['full_page'] or len(logs) >= PAGE_SIZE
 
                     for log in logs:
-                        await self.send_log_to_chat(info['chat_id'], project_name, log)
-                        await asyncio.sleep(1)  # TimeOut Spammer
-
-                    # Set Last Cheking
-                    self.update_last_check(project_name)
+                        if not log_matches(filters, log):
+                            continue
+                        if str(log.get('level', '')).upper() in URGENT_LEVELS:
+                            stats['urgent'] = True
+                        await self.forward_log(project_name, info, log)
+
+                # Set Last Cheking (Older APIs have no cursor -> since)
+                if not next_cursor:
+                    if logs:
+                        self.update_last_check(project_name)
+                elif next_cursor != fetch_cursor:
+                    fetch_cursor = info['fetch_cursor'] = next_cursor
+                    self.enqueue_checkpoint(info['chat_id'], project_name, next_cursor)
+                self.perf.phases['forward'].add(time.perf_counter() - forwarding)
+
+                if not has_more:
+                    break
 
+        except Exception as e:
+            logger.error(f"Error Checking Project: {project_name}: {str(e)}")
+            stats['failed'] = True
+
+        self.perf.checks.add(time.perf_counter() - check_started)
+        return stats
+
+    @staticmethod
+    def next_interval(info: dict, stats: dict = None) -> float:
+        """Faster After Busy Polls, Exponential Backoff When Quiet / Failing"""
+        min_interval = info.get('min_interval') or POLL_MIN_INTERVAL
+        max_interval = max(info.get('max_interval') or POLL_MAX_INTERVAL, min_interval)
+        interval = info.get('interval', POLL_START_INTERVAL)
+        if stats is None:  # Streaming -> Polling is only a fallback
+            interval = max_interval
+        elif stats['failed'] or not stats['logs']:
+            interval *= 2
+        elif stats['full_page'] or stats['urgent']:
+            interval /= POLL_SPEEDUP
+        return min(max(interval, min_interval), max_interval)
+
+    def schedule_project(self, project_name: str, delay: float):
+        """Push Next Due Time (Older Heap Entries Of The Project Are Skipped)"""
+        due = asyncio.get_running_loop().time() + delay
+        self.projects[project_name]['next_due'] = due
+        heapq.heappush(self.schedule, (due, project_name))
+        self.schedule_event.set()
+
+    async def poll_project(self, project_name: str):
+        """Check One Project And Schedule Its Next Check"""
+        try:
+            info = self.projects[project_name]
+            stats = None if project_name in self.streams else await self.check_project(project_name, info)
+            if STREAMING:
+                self.start_streams()
+            if self.is_running and self.projects.get(project_name) is info:
+                info['interval'] = self.next_interval(info, stats)
+                self.schedule_project(project_name, info['interval'])
+        finally:
+            self.polls.pop(project_name, None)
+
+    def start_streams(self):
+        """Subscribe To Projects That Support Cursors (After The First Check Caught Up)"""
+        for project_name, info in self.projects.items():
+            if project_name not in self.streams and info.get('fetch_cursor', info['log_cursor']):
+                self.streams[project_name] = asyncio.create_task(self.stream_project(project_name))
+
+    def stop_streams(self):
+        for task in self.streams.values():
+            task.cancel()
+        self.streams = {}
+
+    async def stream_project(self, project_name: str):
+        """New Logs Of One Project As They Are Saved (Resume From Cursor On Reconnect)"""
+        delay = 1
+        while self.is_running and project_name in self.projects:
+            info = self.projects[project_name]
+            filters = project_filters(info['tags'], info['min_level'])
+            try:
+                async for log, log_cursor in stream_logs_from_project(
+                        self.get_http(), project_name, info['api_url'], info.get('fetch_cursor', info['log_cursor']),
+                        filters):
+                    delay = 1
+                    if log_matches(filters, log):
+                        await self.forward_log(project_name, info, log)
+                    if log_cursor:
+                        info['fetch_cursor'] = log_cursor
+                        self.enqueue_checkpoint(info['chat_id'], project_name, log_cursor)
+            except StreamNotSupportedError as e:
+                logger.warning(f"Streaming Not Supported (Polling Instead): {str(e)}")
+                break
             except Exception as e:
-                logger.error(f"Error Checking Project: {project_name}: {str(e)}")
-                await asyncio.sleep(2)
+                logger.warning(f"Stream Disconnected {project_name} (Retry In {delay}s): {str(e)}")
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, STREAM_RECONNECT_MAX_DELAY)
+
+        self.streams.pop(project_name, None)
+
+    def get_http(self) -> aiohttp.ClientSession:
+        if self.http is None or self.http.closed:
+            self.http = create_http_session()
+        return self.http
+
+    async def close(self):
+        """Shutdown (HTTP Session, Delivery Workers, Storage)"""
+        self.stop_streams()
+        for task in self.chat_workers.values():
+            task.cancel()
+        if self.maintenance_task is not None:
+            self.maintenance_task.cancel()
+        if self.repeat_task is not None:
+            self.repeat_task.cancel()
+        if self.lag_task is not None:
+            self.lag_task.cancel()
+        if self.perf_server is not None:
+            await self.perf_server.cleanup()
+        if self.http is not None and not self.http.closed:
+            await self.http.close()
+        await self.flush_pending()
+        self.storage.close()
+
+    def chat_queue(self, chat_id: int) -> asyncio.Queue:
+        """Delivery Queue (One Worker Per Chat)"""
+        if chat_id not in self.chat_queues:
+            self.chat_queues[chat_id] = asyncio.Queue()
+            self.chat_workers[chat_id] = asyncio.create_task(self.delivery_worker(chat_id))
+        return self.chat_queues[chat_id]
+
+    async def forward_log(self, project_name: str, info: dict, log: dict):
+        """New Log -> Chat Queue (Skip Duplicates / Count Repeats)"""
+        if await self.is_duplicate(project_name, log):
+            return
+        if GROUP_REPEATS and self.count_repeat(project_name, info['chat_id'], log):
+            self.mark_sent([(project_name, log)])
+            return
+        self.enqueue_log(info['chat_id'], project_name, log)
+
+    def count_repeat(self, project_name: str, chat_id: int, log: dict) -> bool:
+        """True == Issue Already Sent (Counted For The Next Update)"""
+        key = (project_name, log_fingerprint(log))
+        now = time.monotonic()
+        repeats = int(log.get('repeats') or 1)  # Logs the API collapsed into this one
+        issue = self.repeats.get(key)
+        if issue is not None and now - issue['last_seen'] < REPEAT_EXPIRE:
+            issue['pending'] += repeats
+            issue['total'] += repeats
+            issue['last_seen'] = now
+            self.repeats.move_to_end(key)
+            return True
 
-    def update_last_check(self, project_name: str):
-        """Update Last Check (Setter)"""
+        self.repeats[key] = {'chat_id': chat_id, 'log': log, 'pending': repeats - 1, 'total': repeats,
+                             'last_seen': now}
+        self.repeats.move_to_end(key)
+        while len(self.repeats) > REPEAT_CACHE_SIZE:
+            self.repeats.popitem(last=False)
+        return False
+
+    async def send_repeat_updates(self):
+        """×N more (Every REPEAT_UPDATE_INTERVAL)"""
+        while True:
+            await asyncio.sleep(REPEAT_UPDATE_INTERVAL)
+            for (project_name, _), issue in list(self.repeats.items()):
+                if not issue['pending']:
+                    continue
+                repeats, issue['pending'] = issue['pending'], 0
+                try:
+                    await self.send_message(issue['chat_id'],
+                                            format_repeat_message(project_name, issue['log'], repeats, issue['total']))
+                except Exception as e:
+                    logger.error(f"Error In Repeat Update {project_name}: {str(e)}")
+
+    def enqueue_log(self, chat_id: int, project_name: str, log: dict):
+        self.chat_queue(chat_id).put_nowait(('log', project_name, log))
+
+    def enqueue_checkpoint(self, chat_id: int, project_name: str, log_cursor: str):
+        """Save Cursor After Every Log Before It Is Sent"""
+        self.chat_queue(chat_id).put_nowait(('checkpoint', project_name, log_cursor))
+
+    async def delivery_worker(self, chat_id: int):
+        """Send Queued Logs Of One Chat"""
+        chat_queue = self.chat_queues[chat_id]
+        while True:
+            items = [await chat_queue.get()]
+            try:
+                if BATCH_DELIVERY:
+                    await self.collect_batch(chat_queue, items)
+                    entries = [(project_name, item) for kind, project_name, item in items if kind == 'log']
+                    if entries:
+                        await self.send_logs_batch(chat_id, entries)
+                elif items[0][0] == 'log':
+                    _, project_name, log = items[0]
+                    await self.send_log_to_chat(chat_id, project_name, log)
+
+                # Checkpoints come after their logs -> Save once the logs are sent
+                for kind, project_name, item in items:
+                    if kind == 'checkpoint' and project_name in self.projects:
+                        self.update_last_check(project_name, item)
+            except Exception as e:
+                logger.error(f"Error In Delivery {chat_id}: {str(e)}")
+            finally:
+                for _ in items:
+                    chat_queue.task_done()
+
+    @staticmethod
+    async def collect_batch(chat_queue: asyncio.Queue, items: list):
+        """Wait Up To BATCH_WINDOW For More Logs (Max BATCH_MAX_LOGS)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + BATCH_WINDOW
+        log_count = sum(1 for kind, _, _ in items if kind == 'log')
+        while log_count < BATCH_MAX_LOGS:
+            try:
+                if chat_queue.empty():
+                    item = await asyncio.wait_for(chat_queue.get(), max(deadline - loop.time(), 0))
+                else:
+                    item = chat_queue.get_nowait()
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            if item[0] == 'log':
+                log_count += 1
+
+    def update_last_check(self, project_name: str, log_cursor: str = None):
+        """Update Last Check (Setter, Saved By storage_maintenance)"""
         now = datetime.now().isoformat()
         self.projects[project_name]['last_check'] = now
-
-        conn = sqlite3.connect('logger_bot.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE projects SET last_check = ? WHERE name = ?
-        ''', (now, project_name))
-        conn.commit()
-        conn.close()
+        self.projects[project_name]['log_cursor'] = log_cursor
+        self.pending_checks[project_name] = (now, log_cursor)
 
     async def start_monitoring(self):
         """Monotoring (Start)"""
@@ -286,18 +1291,33 @@ class TelegramLoggerBot:
             return False, "مانیتورینگ از قبل متوقف است! ⏹"
 
         self.is_running = False
+        self.schedule_event.set()
+        self.stop_streams()
         return True, "مانیتورینگ متوقف شد! ⏹"
 
     async def monitoring_loop(self):
-        """Monotoring (Main Loop)"""
+        """Monotoring (Main Loop, Due Projects From The Heap)"""
+        loop = asyncio.get_running_loop()
+        self.schedule = []
+        for project_name in self.projects:
+            self.schedule_project(project_name, 0)
+
         while self.is_running:
+            self.schedule_event.clear()
+            now = loop.time()
+            while self.schedule and self.schedule[0][0] <= now:
+                due, project_name = heapq.heappop(self.schedule)
+                info = self.projects.get(project_name)
+                if info is None or info.get('next_due') != due or project_name in self.polls:
+                    continue
+                self.perf.due_lag.add(now - due)
+                self.polls[project_name] = asyncio.create_task(self.poll_project(project_name))
+
+            timeout = self.schedule[0][0] - now if self.schedule else None
             try:
-                await self.check_all_projects()
-                # Cron 1 Hour
-                await asyncio.sleep(3600)  # 1 hour
-            except Exception as e:
-                logger.error(f"Error In Monitoring: {str(e)}")
-                await asyncio.sleep(60)
+                await asyncio.wait_for(self.schedule_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
 
     def setup_handlers(self):
         @self.client.on(events.NewMessage(pattern='/start'))
@@ -332,9 +1352,11 @@ class TelegramLoggerBot:
             if data == "add_project":
                 await event.respond(
                     "📝 **افزودن پروژه جدید**\n\n"
-                    "Format:\n `/add Project_name API_URL CHAT_ID [TAGS]`\n\n"
+                    "Format:\n `/add Project_name API_URL CHAT_ID [TAGS] [level=LEVEL] [min=SECONDS] [max=SECONDS]`\n\n"
                     "Example:\n"
-                    "`/add RooxProject http://192.168.1.100:8000 -1001234567890 error,warning`"
+                    "`/add RooxProject http://192.168.1.100:8000 -1001234567890 error,warning`\n"
+                    "`/add RooxProject http://192.168.1.100:8000 -1001234567890 payment level=WARNING`\n"
+                    "`/add RooxProject http://192.168.1.100:8000 -1001234567890 min=30 max=600`"
                 )
 
             elif data == "list_projects":
@@ -366,15 +1388,18 @@ class TelegramLoggerBot:
 ℹ️ **راهنمای استفاده**
 
 **دستورات:**
-• `/add نام API_URL CHAT_ID [TAGS]` - افزودن پروژه
+• `/add نام API_URL CHAT_ID [TAGS] [level=سطح] [min=ثانیه] [max=ثانیه]` - افزودن پروژه
 • `/remove نام_پروژه` - حذف پروژه  
+• `/search نام_پروژه متن` - جستجو در لاگ‌ها
 • `/list` - نمایش پروژه‌ها
 • `/start_monitor` - شروع مانیتورینگ
 • `/stop_monitor` - توقف مانیتورینگ
 • `/status` - وضعیت ربات
+• `/perf` - کارایی ربات (زمان دریافت، ارسال، صف‌ها)
 
 **نکات:**
-- ربات هر ساعت یکبار پروژه‌ها را چک می‌کند
+- پروژه‌های پرکار زودتر (تا هر دقیقه) و پروژه‌های ساکت دیرتر (تا هر ساعت) چک می‌شوند
+- فقط لاگ‌های با تگ‌ها / سطح‌های پروژه ارسال می‌شوند (مثلاً `error,warning` یا `level=WARNING`)
 - API باید endpoint `/logs` داشته باشد
 - فرمت پاسخ API باید JSON باشد
 - CHAT_ID میتواند گروه یا کانال باشد
@@ -391,19 +1416,27 @@ class TelegramLoggerBot:
             try:
                 args = event.pattern_match.group(1).split()
                 if len(args) < 3:
-                    await event.respond("❌ فرمت نادرست!\n\n`/add نام_پروژه API_URL CHAT_ID [TAGS]`")
+                    await event.respond("❌ فرمت نادرست!\n\n`/add نام_پروژه API_URL CHAT_ID [TAGS] [level=سطح] [min=ثانیه] [max=ثانیه]`")
                     return
 
                 name = args[0]
                 api_url = args[1]
                 chat_id = int(args[2])
-                tags = args[3] if len(args) > 3 else ""
+                options = dict(arg.split('=', 1) for arg in args[3:] if '=' in arg)
+                tags = next((arg for arg in args[3:] if '=' not in arg), "")
+                min_interval = int(options['min']) if 'min' in options else None
+                max_interval = int(options['max']) if 'max' in options else None
+                min_level = options['level'].upper() if 'level' in options else None
+                if min_level and min_level not in LEVELS:
+                    await event.respond(f"❌ سطح نامعتبر! ({', '.join(LEVELS)})")
+                    return
 
-                success, message = await self.add_project(name, api_url, chat_id, tags)
+                success, message = await self.add_project(name, api_url, chat_id, tags, min_interval, max_interval,
+                                                          min_level)
                 await event.respond(message)
 
             except ValueError:
-                await event.respond("❌ CHAT_ID باید عدد باشد!")
+                await event.respond("❌ CHAT_ID و min / max باید عدد باشند!")
             except Exception as e:
                 await event.respond(f"❌ خطا: {str(e)}")
 
@@ -416,6 +1449,24 @@ class TelegramLoggerBot:
             success, message = await self.remove_project(name)
             await event.respond(message)
 
+        @self.client.on(events.NewMessage(pattern=r'/search (\S+) (.+)'))
+        async def search_handler(event):
+            if event.sender_id != ADMIN_USER_ID:
+                return
+
+            name, query = event.pattern_match.group(1), event.pattern_match.group(2).strip()
+            if name not in self.projects:
+                await event.respond(f"پروژه '{name}' یافت نشد ❌")
+                return
+
+            try:
+                logs, has_more = await search_project_logs(self.get_http(), name, self.projects[name]['api_url'], query)
+                await event.respond(format_search_results(name, query, logs, has_more))
+            except SearchNotSupportedError:
+                await event.respond(f"API پروژه '{name}' جستجو ندارد ❌")
+            except Exception as e:
+                await event.respond(f"❌ خطا در جستجو: {str(e)}")
+
         @self.client.on(events.NewMessage(pattern='/list'))
         async def list_handler(event):
             if event.sender_id != ADMIN_USER_ID:
@@ -447,15 +1498,44 @@ class TelegramLoggerBot:
 
             status = "🟢 فعال" if self.is_running else "🔴 غیرفعال"
             projects_count = len(self.projects)
+            backlog = sum(self.delivery_backlog().values())
 
             await event.respond(
                 f"📊 **وضعیت ربات**\n\n"
                 f"• مانیتورینگ: {status}\n"
                 f"• تعداد پروژه‌ها: {projects_count}\n"
+                f"• صف ارسال: {backlog}\n"
                 f"• آخرین آپدیت: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
             )
 
+        @self.client.on(events.NewMessage(pattern='/perf'))
+        async def perf_handler(event):
+            if event.sender_id != ADMIN_USER_ID:
+                return
+
+            await event.respond(self.perf.report(self.delivery_backlog()))
+
+    async def start_perf_server(self, port: int):
+        """Local /metrics (Prometheus Text Format)"""
+        async def metrics_handler(request):
+            return web.Response(text=self.perf.render_metrics(self.delivery_backlog()),
+                                content_type='text/plain', charset='utf-8')
+
+        app = web.Application()
+        app.router.add_get('/metrics', metrics_handler)
+        self.perf_server = web.AppRunner(app, access_log=None)
+        await self.perf_server.setup()
+        await web.TCPSite(self.perf_server, '127.0.0.1', port).start()
+        logger.info(f"Metrics: http://127.0.0.1:{port}/metrics")
+
     async def run(self):
+        self.get_http()
+        self.maintenance_task = asyncio.create_task(self.storage_maintenance())
+        self.lag_task = asyncio.create_task(self.perf.measure_loop_lag())
+        if GROUP_REPEATS:
+            self.repeat_task = asyncio.create_task(self.send_repeat_updates())
+        if PERF_HTTP_PORT:
+            await self.start_perf_server(PERF_HTTP_PORT)
         await self.client.start(bot_token=BOT_TOKEN)
         self.setup_handlers()
         logger.info("Running Bot Tel")
@@ -471,7 +1551,10 @@ class TelegramLoggerBot:
             logger.error(e)
             pass
 
-        await self.client.run_until_disconnected()
+        try:
+            await self.client.run_until_disconnected()
+        finally:
+            await self.close()
 
 
 # Running
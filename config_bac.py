@@ -1,4 +1,24 @@
 API_ID = 11111111  # From my.telegram.org
 API_HASH = ""
 BOT_TOKEN = ""
-ADMIN_USER_ID = 1111111111  # Your Admin ID
\ No newline at end of file
+ADMIN_USER_ID = 1111111111  # Your Admin ID
+
+# Optional (Performance)
+MAX_CONCURRENT_FETCHES = 10  # Projects fetched at the same time
+POLL_MIN_INTERVAL = 60  # Seconds between checks of a busy project
+POLL_MAX_INTERVAL = 3600  # Seconds between checks of a quiet project
+HTTP_POOL_SIZE = 100  # Open connections (all projects)
+HTTP_LIMIT_PER_HOST = 4  # Open connections per project API
+BATCH_DELIVERY = False  # True: many logs in one message
+BATCH_WINDOW = 2.0  # Seconds to wait for more logs before sending
+BATCH_MAX_LOGS = 50  # Logs collected for one send
+GLOBAL_SEND_RATE = 30  # Messages per second (all chats)
+PRIVATE_CHAT_SEND_RATE = 1  # Messages per second (one user)
+GROUP_CHAT_SEND_RATE = 20 / 60  # Messages per second (one group / channel)
+DEDUP_CACHE_SIZE = 100000  # Recently sent logs kept in memory (duplicate check)
+DEDUP_BLOOM = True  # Bloom filter for older sent logs
+SENT_LOGS_RETENTION_DAYS = 7  # sent_logs rows are deleted after this many days
+STREAMING = False  # Get new logs in real time from /logs/stream instead of polling
+GROUP_REPEATS = False  # True: one message per repeated error + "×N more" updates
+REPEAT_UPDATE_INTERVAL = 300  # Seconds between "×N more" messages
+PERF_HTTP_PORT = None  # e.g. 9464: Bot metrics on http://127.0.0.1:9464/metrics (Prometheus)
@@ -1,15 +1,47 @@
 # API_log Default (FastAPI - Easy)
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, Response
 import sqlite3
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 import uuid
+import re
+import hashlib
+import zlib
+import gzip
+import sys
+import codecs
+import base64
 import os
+import time
+import atexit
+import asyncio
+import queue
+import threading
+import tempfile
+import multiprocessing
+from multiprocessing.connection import Listener, Client
+import weakref
+import heapq
+from bisect import bisect_left
+from collections import deque, Counter
+from json.encoder import encode_basestring as encode_json_string
+from contextlib import contextmanager
 import uvicorn
 
+try:  # Optional: /logs?format=msgpack, Content-Encoding: br
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 
 class LogEntry(BaseModel):
     level: str  # ERROR, WARNING, INFO, DEBUG, SUCCESS (== Bot)
@@ -21,14 +53,100 @@ class LogEntry(BaseModel):
 
 class LogResponse(BaseModel):
     logs: List[Dict[str, Any]]
-    total: int
+    total: Optional[int] = None  # Only with with_total=true
     since: Optional[str] = None
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+class SearchResponse(BaseModel):
+    query: str
+    logs: List[Dict[str, Any]]  # Best match first (+ snippet, rank)
+    offset: int = 0
+    next_offset: Optional[int] = None
+    has_more: bool = False
 
 
 # Config
 PROJECT_NAME = os.getenv('PROJECT_NAME', 'default_project')  # Name Project
 DATABASE_PATH = f'{PROJECT_NAME}_logs.db'
 MAX_LOGS_PER_REQUEST = 100
+MAX_LOGS_PER_BATCH = int(os.getenv('MAX_LOGS_PER_BATCH', '10000'))  # POST /logs/batch
+BATCH_CHUNK_SIZE = int(os.getenv('BATCH_CHUNK_SIZE', '1000'))  # Logs per transaction
+MAX_BATCH_ENTRY_BYTES = 1024 * 1024  # Largest single entry in a batch body
+
+# Buffered Mode (ProjectLogger)
+LOG_BUFFERED = os.getenv('LOG_BUFFERED', '0') == '1'
+LOG_BUFFER_SIZE = int(os.getenv('LOG_BUFFER_SIZE', '10000'))  # Max queued logs
+LOG_FLUSH_SIZE = int(os.getenv('LOG_FLUSH_SIZE', '500'))  # Flush when this many logs are queued
+LOG_FLUSH_INTERVAL = float(os.getenv('LOG_FLUSH_INTERVAL', '1.0'))  # Max age (seconds) of a queued log
+LOG_OVERFLOW_POLICY = os.getenv('LOG_OVERFLOW_POLICY', 'block')  # block, drop_debug, drop_oldest
+
+# Server (python logger_api.py; API_WORKERS > 1: uvicorn workers -> one writer process)
+API_HOST = os.getenv('API_HOST', '127.0.0.1')
+API_PORT = int(os.getenv('API_PORT', '8113'))
+API_WORKERS = int(os.getenv('API_WORKERS', '1'))
+LOG_WRITER_SOCKET = os.getenv('LOG_WRITER_SOCKET')  # Set for the workers by __main__
+LOG_WRITER_AUTHKEY = bytes.fromhex(os.getenv('LOG_WRITER_AUTHKEY', ''))
+LOG_WRITER_BATCH = int(os.getenv('LOG_WRITER_BATCH', str(BATCH_CHUNK_SIZE)))  # Max logs per group commit
+LOG_WRITER_CONNECTIONS = int(os.getenv('LOG_WRITER_CONNECTIONS', '8'))  # Requests in flight per worker
+LOG_WRITER_RESTART_WAIT = 15  # Seconds a worker waits for a restarted writer
+
+# Streaming (/logs/stream, /logs?wait=)
+MAX_WAIT_SECONDS = 60  # Long-poll limit
+STREAM_POLL_INTERVAL = 1.0  # Re-check the database (logs written by other processes)
+STREAM_HEARTBEAT = 15  # Seconds between keep-alive comments
+
+# SQLite Connections
+DB_READERS = int(os.getenv('DB_READERS', '4'))  # Reader pool size
+DB_CACHE_SIZE_KB = int(os.getenv('DB_CACHE_SIZE_KB', '16384'))  # Page cache per connection
+DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', str(256 * 1024 * 1024)))
+DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', '5000'))
+
+# Stats Rollups (/stats)
+ROLLUP_MINUTE_DAYS = 8  # Per-minute counters are kept this long (last_7days is exact to the minute)
+CREATED_AT_FORMAT = '%Y-%m-%d %H:%M:%S'  # SQLite CURRENT_TIMESTAMP (UTC)
+
+# Partitions (One Table Set Per Day / Hour Of created_at, Retention Drops Whole Partitions)
+LOG_PARTITION = os.getenv('LOG_PARTITION', 'day')  # day, hour
+PARTITION_KEY_LENGTHS = {'day': 10, 'hour': 13}  # created_at prefix: '2026-10-17' / '2026-10-17 05'
+
+# Full-Text Search (/logs/search, SQLite FTS5)
+LOG_SEARCH = os.getenv('LOG_SEARCH', '1') == '1'
+SNIPPET_MARK = '**'  # Around matched words in snippets (Markdown bold)
+SNIPPET_TOKENS = 16
+
+# Compression (message / extra)
+LOG_COMPRESS_MIN_BYTES = int(os.getenv('LOG_COMPRESS_MIN_BYTES', '1024'))  # Larger payloads are stored compressed (0 == off)
+LOG_COMPRESS_LEVEL = 6
+DICT_MAX_BYTES = 32 * 1024  # zlib preset dictionary limit
+DICT_SAMPLES = 2000  # Recent large payloads used to train a dictionary
+CODEC_ZLIB = 1
+CODEC_ZLIB_DICT = 2
+
+# Responses (/logs)
+RESPONSE_COMPRESS_MIN_BYTES = 1024  # gzip / brotli only above this size
+LOG_COLUMNS = ['id', 'level', 'message', 'tags', 'extra', 'timestamp', 'created_at', 'fingerprint', 'repeats']
+
+# Issues (Repeated Logs Grouped By Fingerprint)
+COLLAPSE_REPEATS = int(os.getenv('COLLAPSE_REPEATS', '0'))  # Seconds: store one log per issue in this window (0 == all)
+TEMPLATE_PATTERNS = [  # message -> template (order matters)
+    (re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'), '<uuid>'),
+    (re.compile(r'(?:[A-Za-z]:)?(?:[\\/][\w.\-]+){2,}[\\/]?'), '<path>'),
+    (re.compile(r'\b0x[0-9a-fA-F]+\b|\b[0-9a-fA-F]{16,}\b'), '<hex>'),
+    (re.compile(r'\d+(?:\.\d+)?'), '<n>'),
+]
+
+# Severity (min_level=)
+LEVEL_ORDER = ['DEBUG', 'INFO', 'SUCCESS', 'WARNING', 'ERROR', 'CRITICAL']
+
+# Metrics (/metrics, Prometheus text format)
+METRICS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Seconds
+
+INSERT_LOG_SQL = '''
+    INSERT INTO {table} (seq, created_at, id, level, message, tags, extra, timestamp, fingerprint, repeats)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
 
 app = FastAPI(
     title=f"Logger API - {PROJECT_NAME}",
@@ -46,133 +164,1632 @@ app.add_middleware(
 )
 
 
+class PayloadCodec:
+    """
+    Large message / extra -> BLOB (Format Byte + Data); TEXT == Not Compressed (Older Rows)
+
+    - CODEC_ZLIB: zlib
+    - CODEC_ZLIB_DICT: zlib with a trained preset dictionary (4 byte dictionary id after the format byte)
+    """
+
+    def __init__(self, min_bytes: int = LOG_COMPRESS_MIN_BYTES, level: int = LOG_COMPRESS_LEVEL):
+        self.min_bytes = min_bytes
+        self.level = level
+        self.dicts = {}  # id -> dictionary (compression_dicts)
+        self.dict_id = None  # Dictionary for new rows (newest)
+
+    def load(self, conn: sqlite3.Connection):
+        self.dicts = dict(conn.execute("SELECT id, data FROM compression_dicts").fetchall())
+        self.dict_id = max(self.dicts) if self.dicts else None
+
+    def encode(self, text: str):
+        if not self.min_bytes or len(text) < self.min_bytes:
+            return text
+        data = text.encode()
+        if self.dict_id is not None:
+            compressor = zlib.compressobj(self.level, zdict=self.dicts[self.dict_id])
+            blob = bytes([CODEC_ZLIB_DICT]) + self.dict_id.to_bytes(4, 'big') + \
+                compressor.compress(data) + compressor.flush()
+        else:
+            blob = bytes([CODEC_ZLIB]) + zlib.compress(data, self.level)
+        return blob if len(blob) < len(data) else text
+
+    def decode(self, value):
+        """Stored Value -> Text (Only For Rows That Are Returned)"""
+        if not isinstance(value, bytes):
+            return value
+        if value[0] == CODEC_ZLIB:
+            return zlib.decompress(value[1:]).decode()
+        if value[0] == CODEC_ZLIB_DICT:
+            dict_id = int.from_bytes(value[1:5], 'big')
+            if dict_id not in self.dicts:  # Trained by another process
+                with db.read() as conn:
+                    self.load(conn)
+            decompressor = zlib.decompressobj(zdict=self.dicts[dict_id])
+            return (decompressor.decompress(value[5:]) + decompressor.flush()).decode()
+        raise ValueError(f"Unknown payload format: {value[0]}")
+
+
+payload_codec = PayloadCodec()
+
+
+class Histogram:
+    """Fixed Buckets (No Allocation Per Observation, Observed From Any Thread)"""
+
+    def __init__(self, buckets: tuple = METRICS_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot: +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def samples(self, name: str, labels: str = "") -> List[str]:
+        """Prometheus Sample Lines (labels: 'process="writer"')"""
+        with self._lock:
+            counts, value_sum = list(self.counts), self.sum
+        braces = f"{{{labels}}}" if labels else ""
+        lines = []
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), counts):
+            total += count
+            lines.append(f'{name}_bucket{{{labels + "," if labels else ""}le="{bound}"}} {total}')
+        lines += [f"{name}_sum{braces} {value_sum}", f"{name}_count{braces} {total}"]
+        return lines
+
+
+class Metrics:
+    """
+    Process Counters For /metrics
+
+    Updated from request threads, the event loop and LogBuffer threads: level / error counters and histograms
+    take a lock, db_* counters change under the db write lock.
+    """
+
+    def __init__(self):
+        self.ingested = dict.fromkeys(LEVEL_ORDER + ['OTHER'], 0)
+        self.ingest_errors = 0
+        self.add_log = Histogram()
+        self.get_logs = Histogram()
+        self.cleanup = Histogram()
+        self.db_busy = 0  # BEGIN IMMEDIATE found another writer (other process)
+        self.db_retries = 0
+        self.db_locked = 0  # Gave up after DB_BUSY_TIMEOUT_MS
+        self.buffers = weakref.WeakSet()  # LogBuffer instances
+        self._lock = threading.Lock()
+
+    def count_levels(self, rows: List[tuple]):
+        ingested = self.ingested
+        with self._lock:
+            for row in rows:
+                level = row[1]
+                if level in ingested:
+                    ingested[level] += 1
+                else:
+                    ingested['OTHER'] += 1
+
+    def count_errors(self, count: int):
+        with self._lock:
+            self.ingest_errors += count
+
+    def families(self, labels: str = "") -> Dict[str, tuple]:
+        """name -> (type, help, sample lines) Of This Process (Picklable: Sent By The Writer Process)"""
+        braces = f"{{{labels}}}" if labels else ""
+        families = {
+            "loggram_logs_ingested_total": ("counter", "Logs written, by level", [
+                f'loggram_logs_ingested_total{{{labels + "," if labels else ""}level="{level}"}} {count}'
+                for level, count in self.ingested.items()]),
+            "loggram_add_log_seconds": ("histogram", "Time to write one log or batch (one transaction)",
+                                        self.add_log.samples("loggram_add_log_seconds", labels)),
+            "loggram_get_logs_seconds": ("histogram", "Time to read one page of logs",
+                                         self.get_logs.samples("loggram_get_logs_seconds", labels)),
+            "loggram_cleanup_seconds": ("histogram", "Time to delete old logs",
+                                        self.cleanup.samples("loggram_cleanup_seconds", labels)),
+        }
+
+        buffers = list(self.buffers)
+        wal_path = DATABASE_PATH + "-wal"
+        values = [
+            ("loggram_ingest_errors_total", "counter", "Failed log writes", self.ingest_errors),
+            ("loggram_db_busy_total", "counter", "Write transactions that found another writer", self.db_busy),
+            ("loggram_db_retries_total", "counter", "BEGIN IMMEDIATE retries", self.db_retries),
+            ("loggram_db_locked_total", "counter", "Writes that gave up: database is locked", self.db_locked),
+            ("loggram_db_size_bytes", "gauge", "Database file size",
+             os.path.getsize(DATABASE_PATH) if os.path.exists(DATABASE_PATH) else 0),
+            ("loggram_db_wal_size_bytes", "gauge", "WAL file size",
+             os.path.getsize(wal_path) if os.path.exists(wal_path) else 0),
+            ("loggram_db_readers_open", "gauge", "Open reader connections", db.opened),
+            ("loggram_buffer_depth", "gauge", "Logs queued in write-behind buffers",
+             sum(buffer.depth() for buffer in buffers)),
+            ("loggram_buffer_dropped_total", "counter", "Logs dropped by buffer overflow policies",
+             sum(buffer.dropped for buffer in buffers)),
+            ("loggram_buffer_failed_total", "counter", "Buffered logs that could not be written",
+             sum(buffer.failed for buffer in buffers)),
+            ("loggram_stream_waiters", "gauge", "Long-poll / SSE requests waiting for new logs",
+             log_notifier.waiters),
+        ]
+        for name, kind, help_text, value in values:
+            families[name] = (kind, help_text, [f"{name}{braces} {value}"])
+        return families
+
+    def render(self, *others: Dict[str, tuple], labels: str = "") -> str:
+        """
+        Prometheus Text Of This Process (+ Families Of Other Processes)
+
+        API_WORKERS > 1: the writer's families + the worker that answers, each with a `process` label
+        """
+        merged = {}
+        for families in (*others, self.families(labels)):
+            for name, (kind, help_text, samples) in families.items():
+                merged.setdefault(name, (kind, help_text, []))[2].extend(samples)
+        lines = []
+        for name, (kind, help_text, samples) in merged.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", *samples]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+class Database:
+    """One Long-Lived Writer + Pool Of Readers (WAL)"""
+
+    def __init__(self, path: str, readers: int = DB_READERS):
+        self.path = path
+        self.readers = readers
+        self._writer = None
+        self._write_lock = threading.Lock()
+        self._pool = queue.LifoQueue()
+        self._opened = 0
+        self._pool_lock = threading.Lock()
+        self.search = False  # FTS5 is available (init_database)
+        atexit.register(self.close)
+
+    def _connect(self, timeout: float = DB_BUSY_TIMEOUT_MS / 1000) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256, timeout=timeout)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.create_function("log_text", 1, payload_codec.decode, deterministic=True)  # Compressed -> text
+        return conn
+
+    @contextmanager
+    def write(self, immediate: bool = True):
+        """Writer Connection (Serialized, One Transaction)"""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect(timeout=0)  # Busy: retried (and counted) in _begin
+            with self._writer:
+                if immediate:  # Take the write lock up front (other processes: consistent reads)
+                    self._begin()
+                yield self._writer
+
+    def _begin(self):
+        """BEGIN IMMEDIATE, Retried While Another Process Writes (Up To DB_BUSY_TIMEOUT_MS)"""
+        deadline = time.monotonic() + DB_BUSY_TIMEOUT_MS / 1000
+        retries = 0
+        while True:
+            try:
+                self._writer.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) and "busy" not in str(e):
+                    raise
+                if not retries:
+                    metrics.db_busy += 1
+                if time.monotonic() >= deadline:
+                    metrics.db_locked += 1
+                    raise
+                retries += 1
+                metrics.db_retries += 1
+                time.sleep(min(0.001 * 2 ** retries, 0.05))
+
+    @contextmanager
+    def read(self):
+        """Reader Connection (From Pool)"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = self._opened < self.readers
+                if can_open:
+                    self._opened += 1
+            if not can_open:
+                conn = self._pool.get()
+            else:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._pool_lock:
+                        self._opened -= 1
+                    raise
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def snapshot(self):
+        """Reader Connection In One Read Transaction (Partitions Dropped Meanwhile Stay Readable)"""
+        with self.read() as conn:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.rollback()
+
+    @property
+    def opened(self) -> int:
+        return self._opened
+
+    def close(self):
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._pool_lock:
+            self._opened = 0
+
+
+db = Database(DATABASE_PATH)
+
+
+class LogNotifier:
+    """New Logs Committed -> Wake Waiters (Long-Poll / SSE)"""
+
+    def __init__(self):
+        self.last_seq = 0
+        self._waiters = set()  # (loop, future)
+        self._lock = threading.Lock()
+
+    def notify(self, seq: int):
+        """Called By Writers (Any Thread)"""
+        with self._lock:
+            self.last_seq = max(self.last_seq, seq)
+            waiters, self._waiters = self._waiters, set()
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(self._wake, future)
+
+    @property
+    def waiters(self) -> int:
+        return len(self._waiters)
+
+    @staticmethod
+    def _wake(future: asyncio.Future):
+        if not future.done():
+            future.set_result(True)
+
+    async def wait(self, after_seq: int, timeout: float) -> bool:
+        """Wait Until A Log Newer Than after_seq Is Committed (False == Timeout)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (loop, future)
+        with self._lock:
+            if self.last_seq > after_seq:
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+
+log_notifier = LogNotifier()
+
+
+def add_column(cursor: sqlite3.Cursor, table: str, column: str, definition: str) -> bool:
+    """ALTER TABLE ADD COLUMN (If Missing) -> Added"""
+    columns = [row[1] for row in cursor.execute(f'PRAGMA table_info({table})')]
+    if column in columns:
+        return False
+    cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+    return True
+
+
 def init_database():
     """Initialize the database"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    if LOG_PARTITION not in PARTITION_KEY_LENGTHS:
+        raise ValueError(f"Unknown partition size: {LOG_PARTITION}")
 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS logs (
-            id TEXT PRIMARY KEY,
-            level TEXT NOT NULL,
-            message TEXT NOT NULL,
-            tags TEXT,
-            extra TEXT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+    with db.write() as conn:
+        cursor = conn.cursor()
 
-    # Indexing
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON logs(timestamp)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_level ON logs(level)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON logs(created_at)')
+        # Partitions: logs (+ log_tags, logs_fts, logs_text) of one day / hour of created_at (partition_tables)
+        # min / max_timestamp: client timestamps (NULL == ''), query_logs skips partitions that cannot match
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS log_partitions (
+                key TEXT PRIMARY KEY,
+                first_seq INTEGER NOT NULL,
+                last_seq INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                min_timestamp TEXT,
+                max_timestamp TEXT
+            )
+        ''')
+        if add_column(cursor, 'log_partitions', 'min_timestamp', 'TEXT'):
+            add_column(cursor, 'log_partitions', 'max_timestamp', 'TEXT')
+            for key, *_ in log_partitions(conn):
+                logs = partition_tables(key)[0]
+                cursor.execute(f'''
+                    UPDATE log_partitions SET (min_timestamp, max_timestamp) =
+                    (SELECT MIN(IFNULL(timestamp, '')), MAX(IFNULL(timestamp, '')) FROM {logs}) WHERE key = ?
+                ''', (key,))
+
+        # seq: Cursor key, global across partitions (never reused, also after its partition is dropped)
+        cursor.execute('CREATE TABLE IF NOT EXISTS log_sequence (seq INTEGER NOT NULL)')
+        if not cursor.execute("SELECT 1 FROM log_sequence").fetchone():
+            cursor.execute("INSERT INTO log_sequence (seq) VALUES (0)")
+
+        # Issues: one row per fingerprint (level + message template + tags)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS issues (
+                fingerprint TEXT PRIMARY KEY,
+                level TEXT NOT NULL,
+                template TEXT NOT NULL,
+                tags TEXT,
+                first_seen DATETIME NOT NULL,
+                last_seen DATETIME NOT NULL,
+                count INTEGER NOT NULL,
+                last_log_id TEXT,
+                last_stored DATETIME,
+                pending INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_issues_last_seen ON issues(last_seen)')
+
+        # Compression dictionaries (CODEC_ZLIB_DICT)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS compression_dicts (
+                id INTEGER PRIMARY KEY,
+                data BLOB NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        payload_codec.load(conn)
+
+        # Rollups: period 'h' (hour bucket, per level and tag) / 'm' (minute bucket, per level). tag '' == all logs
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS log_rollups (
+                period TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                level TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (period, bucket, level, tag)
+            ) WITHOUT ROWID
+        ''')
 
-    conn.commit()
-    conn.close()
+        # Search (message + extra values, one FTS5 table per partition)
+        if LOG_SEARCH:
+            try:
+                cursor.execute("CREATE VIRTUAL TABLE temp.fts_probe USING fts5(text)")
+                cursor.execute("DROP TABLE temp.fts_probe")
+                db.search = True
+            except sqlite3.OperationalError as e:  # SQLite without FTS5
+                print(f"Search disabled: {e}", file=sys.stderr)
 
+        # Migration (Older Databases: One logs Table)
+        if table_exists(conn, 'logs'):
+            migrate_logs_table(conn)
 
+        # Backfill (Search Enabled Later) / Migration (Search Tables With Their Own Copy Of The Text)
+        for key, *_ in log_partitions(conn):
+            logs_fts = partition_tables(key)[2]
+            sql = cursor.execute("SELECT sql FROM sqlite_master WHERE name = ?", (logs_fts,)).fetchone()
+            if db.search and (not sql or "content =" not in sql[0]):
+                cursor.execute(f"DROP TABLE IF EXISTS {logs_fts}")
+                create_partition(conn, key)
+                update_search_index(conn, key, "TRUE")
 
-def get_logs(since: Optional[str] = None, level: Optional[str] = None,
-             limit: int = MAX_LOGS_PER_REQUEST) -> LogResponse:
-    """Get Logsا"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+        log_notifier.last_seq = last_log_seq(conn)
 
-    query = "SELECT * FROM logs WHERE TRUE"
-    params = []
 
-    # Filter (DAte)
-    if since:
-        query += " AND timestamp > ?"
-        params.append(since)
+def table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def partition_key(created_at: str) -> str:
+    """created_at -> Partition Key ('2026-10-17 05:12:00' -> '2026-10-17', hourly: '2026-10-17 05')"""
+    return created_at[:PARTITION_KEY_LENGTHS[LOG_PARTITION]]
+
+
+def partition_tables(key: str) -> tuple:
+    """Partition Key -> (logs, log_tags, logs_fts, logs_text) Names ('2026-10-17' -> logs_20261017, ...)"""
+    suffix = re.sub(r'\D', '', key)
+    return f'logs_{suffix}', f'log_tags_{suffix}', f'logs_fts_{suffix}', f'logs_text_{suffix}'
 
-    # Filter (Level)
-    if level:
-        query += " AND level = ?"
-        params.append(level.upper())
 
-    # Order
-    query += " ORDER BY timestamp DESC LIMIT ?"
-    params.append(limit)
+def log_partitions(conn: sqlite3.Connection) -> List[tuple]:
+    """(key, first_seq, last_seq, count, min_timestamp, max_timestamp) Of Every Partition, Oldest First"""
+    return conn.execute("SELECT key, first_seq, last_seq, count, IFNULL(min_timestamp, ''), IFNULL(max_timestamp, '') "
+                        "FROM log_partitions ORDER BY first_seq").fetchall()
 
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
 
-    logs = []
+def last_log_seq(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT seq FROM log_sequence").fetchone()[0]
+
+
+def create_partition(conn: sqlite3.Connection, key: str):
+    """Tables Of One Partition (If Missing). seq: global, set by insert_logs"""
+    logs, log_tags, logs_fts, logs_text = partition_tables(key)
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {logs} (
+            seq INTEGER PRIMARY KEY,
+            id TEXT UNIQUE NOT NULL,
+            level TEXT NOT NULL,
+            message TEXT NOT NULL,
+            tags TEXT,
+            extra TEXT,
+            timestamp DATETIME,
+            created_at DATETIME NOT NULL,
+            fingerprint TEXT,
+            repeats INTEGER NOT NULL DEFAULT 1
+        )
+    ''')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{logs}_timestamp ON {logs}(timestamp)')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{logs}_level ON {logs}(level)')
+
+    # Tags (One Row Per Log And Tag -> tags= filter). log_seq == seq
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {log_tags} (
+            tag TEXT NOT NULL,
+            log_seq INTEGER NOT NULL,
+            PRIMARY KEY (tag, log_seq)
+        ) WITHOUT ROWID
+    ''')
+
+    # Search (rowid == seq). External content: the text is read from logs (decompressed), not stored twice
+    if db.search:
+        conn.execute(f'''
+            CREATE VIEW IF NOT EXISTS {logs_text} AS
+            SELECT seq, log_text(message) AS message, (
+                SELECT group_concat(value, ' ') FROM json_tree(CASE WHEN json_valid(log_text(extra))
+                                                                    THEN log_text(extra) ELSE '{{}}' END)
+                WHERE atom IS NOT NULL
+            ) AS extra
+            FROM {logs}
+        ''')
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {logs_fts} USING fts5("
+                     f"message, extra, content = '{logs_text}', content_rowid = 'seq', tokenize = 'unicode61')")
+
+
+def drop_partition(conn: sqlite3.Connection, key: str):
+    """Drop One Partition (No Per-Row Deletes) + Its Rollup Buckets (Same created_at Prefix)"""
+    conn.execute("DELETE FROM log_rollups WHERE period IN ('h', 'm') AND bucket >= ? AND bucket < ?", (key, key + '~'))
+    logs, log_tags, logs_fts, logs_text = partition_tables(key)
+    conn.execute(f"DROP TABLE IF EXISTS {logs_fts}")
+    conn.execute(f"DROP VIEW IF EXISTS {logs_text}")
+    conn.execute(f"DROP TABLE IF EXISTS {log_tags}")
+    conn.execute(f"DROP TABLE IF EXISTS {logs}")
+    conn.execute("DELETE FROM log_partitions WHERE key = ?", (key,))
+
+
+def insert_logs(conn: sqlite3.Connection, rows: List[tuple]) -> int:
+    """Insert Into The Current Partition (Next Global seq) -> Newest seq"""
+    seq = last_log_seq(conn)
+    if not rows:
+        return seq
+
+    created_at = created_at_cutoff(timedelta(0))
+    key = partition_key(created_at)
+    newest = conn.execute("SELECT key FROM log_partitions ORDER BY first_seq DESC LIMIT 1").fetchone()
+    if newest and newest[0] > key:  # Clock set back: stay in the newest partition (seq order), at its start
+        key = newest[0]
+        created_at = key + '0000-00-00 00:00:00'[len(key):]
+    if not newest or newest[0] != key:
+        create_partition(conn, key)
+
+    conn.executemany(INSERT_LOG_SQL.format(table=partition_tables(key)[0]),
+                     [(seq + i, created_at) + row for i, row in enumerate(rows, 1)])
+    update_rollups(conn, key, "logs.seq > ?", (seq,))
+    update_log_tags(conn, key, "logs.seq > ?", (seq,))
+    update_search_index(conn, key, "logs.seq > ?", (seq,))
+
+    last_seq = seq + len(rows)
+    timestamps = [row[5] or '' for row in rows]
+    conn.execute("UPDATE log_sequence SET seq = ?", (last_seq,))
+    conn.execute('''
+        INSERT INTO log_partitions (key, first_seq, last_seq, count, min_timestamp, max_timestamp)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (key) DO UPDATE SET last_seq = excluded.last_seq, count = count + excluded.count,
+            min_timestamp = MIN(IFNULL(min_timestamp, excluded.min_timestamp), excluded.min_timestamp),
+            max_timestamp = MAX(IFNULL(max_timestamp, excluded.max_timestamp), excluded.max_timestamp)
+    ''', (key, seq + 1, last_seq, len(rows), min(timestamps), max(timestamps)))
+    return last_seq
+
+
+def migrate_logs_table(conn: sqlite3.Connection):
+    """Migration: logs (One Table) -> Partitions. seq Is Kept (Cursors Stay Valid)"""
+    cursor = conn.cursor()
+    add_column(cursor, 'logs', 'fingerprint', 'TEXT')
+    add_column(cursor, 'logs', 'repeats', 'INTEGER NOT NULL DEFAULT 1')
+    backfill_rollups = not cursor.execute("SELECT 1 FROM log_rollups LIMIT 1").fetchone()
+
+    length = PARTITION_KEY_LENGTHS[LOG_PARTITION]
+    keys = [row[0] for row in cursor.execute(f"SELECT DISTINCT substr(created_at, 1, {length}) FROM logs ORDER BY 1")]
+    for key in keys:
+        create_partition(conn, key)
+        logs = partition_tables(key)[0]
+        cursor.execute(f'''
+            INSERT INTO {logs} (seq, id, level, message, tags, extra, timestamp, created_at, fingerprint, repeats)
+            SELECT rowid, id, level, message, tags, extra, timestamp, created_at, fingerprint, repeats
+            FROM logs WHERE created_at >= ? AND created_at < ?
+        ''', (key, key + '~'))
+        cursor.execute(f'''
+            INSERT INTO log_partitions (key, first_seq, last_seq, count, min_timestamp, max_timestamp)
+            SELECT ?, MIN(seq), MAX(seq), COUNT(*), MIN(IFNULL(timestamp, '')), MAX(IFNULL(timestamp, '')) FROM {logs}
+        ''', (key,))
+        if backfill_rollups:
+            update_rollups(conn, key, "TRUE")
+        update_log_tags(conn, key, "TRUE")
+        update_search_index(conn, key, "TRUE")
+
+    # AUTOINCREMENT: seq of deleted logs is not reused either
+    last_seq = cursor.execute("SELECT IFNULL(MAX(rowid), 0) FROM logs").fetchone()[0]
+    if table_exists(conn, 'sqlite_sequence'):
+        row = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'logs'").fetchone()
+        last_seq = max(last_seq, row[0] if row else 0)
+    cursor.execute("UPDATE log_sequence SET seq = MAX(seq, ?)", (last_seq,))
+
+    for table in ('logs_fts', 'log_tags', 'logs'):
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    print(f"Migrated {len(keys)} partitions ({DATABASE_PATH})", file=sys.stderr)
+
+
+def update_rollups(conn: sqlite3.Connection, key: str, where: str, params: tuple = ()):
+    """Add The Matching Logs Of One Partition To The Rollups"""
+    logs = partition_tables(key)[0]
+    for period, length in (('h', 13), ('m', 16)):
+        conn.execute(f'''
+            INSERT INTO log_rollups (period, bucket, level, tag, count)
+            SELECT '{period}', substr(created_at, 1, {length}), level, '', COUNT(*)
+            FROM {logs} AS logs WHERE {where} GROUP BY 2, 3
+            ON CONFLICT (period, bucket, level, tag) DO UPDATE SET count = count + excluded.count
+        ''', params)
+
+    conn.execute(f'''
+        INSERT INTO log_rollups (period, bucket, level, tag, count)
+        SELECT 'h', substr(logs.created_at, 1, 13), logs.level, tag.value, COUNT(*)
+        FROM {logs} AS logs, json_each(CASE WHEN json_valid(logs.tags) THEN logs.tags ELSE '[]' END) AS tag
+        WHERE {where} GROUP BY 2, 3, 4
+        ON CONFLICT (period, bucket, level, tag) DO UPDATE SET count = count + excluded.count
+    ''', params)
+
+
+def message_template(message: str) -> str:
+    """'Error processing item 7: /tmp/a.csv' -> 'Error processing item <n>: <path>'"""
+    for pattern, mask in TEMPLATE_PATTERNS:
+        message = pattern.sub(mask, message)
+    return message
+
+
+def log_fingerprint(level: str, message: str, tags: Optional[List[str]] = None) -> str:
+    """Same Level + Template + Tags == Same Issue"""
+    key = f"{level.upper()}\x00{message_template(message)}\x00{','.join(sorted(set(tags or [])))}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def update_issues(conn: sqlite3.Connection, rows: List[tuple]) -> List[tuple]:
+    """
+    Count New Rows Per Fingerprint (issues) -> Rows To Store (+ repeats)
+
+    With COLLAPSE_REPEATS, only one log per issue and window is stored; the others are counted in
+    issues and added to `repeats` of the next stored log of the issue.
+    """
+    now = created_at_cutoff(timedelta(0))
+    window_start = created_at_cutoff(timedelta(seconds=COLLAPSE_REPEATS))
+    issues = {}
+    fingerprints = list({row[6] for row in rows})
+    for i in range(0, len(fingerprints), 500):
+        chunk = fingerprints[i:i + 500]
+        for fingerprint, last_stored, pending in conn.execute(
+                f"SELECT fingerprint, last_stored, pending FROM issues WHERE fingerprint IN ({','.join('?' * len(chunk))})",
+                chunk):
+            issues[fingerprint] = {'last_stored': last_stored, 'pending': pending, 'count': 0, 'last_log_id': None}
+
+    stored = []
     for row in rows:
-        log = {
-            'id': row[0],
-            'level': row[1],
-            'message': row[2],
-            'tags': json.loads(row[3]) if row[3] else [],
-            'extra': json.loads(row[4]) if row[4] else {},
-            'timestamp': row[5],
-            'created_at': row[6]
-        }
-        logs.append(log)
+        issue = issues.get(row[6])
+        if issue is None:
+            issue = issues[row[6]] = {'last_stored': None, 'pending': 0, 'count': 0, 'last_log_id': None,
+                                      'level': row[1], 'template': message_template(payload_codec.decode(row[2])),
+                                      'tags': row[3]}
+        issue['count'] += 1
+        if COLLAPSE_REPEATS and issue['last_stored'] and issue['last_stored'] >= window_start:
+            issue['pending'] += 1
+            continue
+        stored.append(row + (issue['pending'] + 1,))
+        issue['last_stored'], issue['pending'], issue['last_log_id'] = now, 0, row[0]
+
+    conn.executemany('''
+        INSERT INTO issues (fingerprint, level, template, tags, first_seen, last_seen, count, last_log_id,
+                            last_stored, pending)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (fingerprint) DO UPDATE SET
+            last_seen = excluded.last_seen, count = count + excluded.count,
+            last_log_id = IFNULL(excluded.last_log_id, last_log_id),
+            last_stored = excluded.last_stored, pending = excluded.pending
+    ''', [(fingerprint, issue.get('level', ''), issue.get('template', ''), issue.get('tags'), now, now,
+           issue['count'], issue['last_log_id'], issue['last_stored'], issue['pending'])
+          for fingerprint, issue in issues.items() if issue['count']])
+    return stored
+
+
+def update_log_tags(conn: sqlite3.Connection, key: str, where: str, params: tuple = ()):
+    """Index The Tags Of The Matching Logs Of One Partition (log_tags)"""
+    logs, log_tags, *_ = partition_tables(key)
+    conn.execute(f'''
+        INSERT OR IGNORE INTO {log_tags} (tag, log_seq)
+        SELECT tag.value, logs.seq
+        FROM {logs} AS logs, json_each(CASE WHEN json_valid(logs.tags) THEN logs.tags ELSE '[]' END) AS tag
+        WHERE {where} AND tag.type = 'text'
+    ''', params)
+
+
+def update_search_index(conn: sqlite3.Connection, key: str, where: str, params: tuple = ()):
+    """Add The Matching Logs Of One Partition To logs_fts (Text From logs_text: extra -> Its Values)"""
+    if not db.search:
+        return
+    _, _, logs_fts, logs_text = partition_tables(key)
+    conn.execute(f'''
+        INSERT INTO {logs_fts} (rowid, message, extra)
+        SELECT logs.seq, logs.message, logs.extra FROM {logs_text} AS logs WHERE {where}
+    ''', params)
+
+
+def fts_query(query: str) -> str:
+    """Plain Words -> FTS5 Phrases (All Must Match, word* Is A Prefix)"""
+    terms = []
+    for word in query.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+
+def search_partitions(conn: sqlite3.Connection, sql: str, match: str, levels: List[str], limit: int) -> List[tuple]:
+    """First limit Matches: Newest Partition First, Best Match First Within It (Older Partitions Are Not Read)"""
+    rows = []
+    for key, *_ in reversed(log_partitions(conn)):
+        logs, _, logs_fts, _ = partition_tables(key)
+        rows += conn.execute(sql.format(logs=logs, logs_fts=logs_fts),
+                             [SNIPPET_MARK, SNIPPET_MARK, SNIPPET_TOKENS, match, *levels, limit - len(rows)]).fetchall()
+        if len(rows) >= limit:
+            break
+    return rows
+
+
+def search_logs(query: str, limit: int = 20, offset: int = 0, level: Optional[str] = None,
+                min_level: Optional[str] = None) -> SearchResponse:
+    """
+    Full-Text Search (Newest Partition First, Best Match First Within A Partition)
 
-    # Count All Logs
-    count_query = "SELECT COUNT(*) FROM logs WHERE TRUE"
-    count_params = []
+    - query: FTS5 syntax (`timeout OR refused`, `"connection reset"`, `pay*`); anything else is searched word by word
+    - Snippets mark matched words with SNIPPET_MARK
+    """
+    if not db.search:
+        raise RuntimeError("Search is disabled")
+
+    levels = [item.upper() for item in split_filter(level)]
+    if min_level:
+        allowed = levels_from(min_level)
+        levels = [item for item in levels if item in allowed] if levels else allowed
+    level_filter = f" AND logs.level IN ({','.join('?' * len(levels))})" if level or min_level else ""
+
+    sql = f'''
+        SELECT logs.id, logs.level, logs.message, logs.tags, logs.extra, logs.timestamp, logs.created_at,
+               snippet({{logs_fts}}, -1, ?, ?, '…', ?), {{logs_fts}}.rank
+        FROM {{logs_fts}} JOIN {{logs}} AS logs ON logs.seq = {{logs_fts}}.rowid
+        WHERE {{logs_fts}} MATCH ?{level_filter}
+        ORDER BY {{logs_fts}}.rank LIMIT ?
+    '''
+    with db.snapshot() as conn:
+        try:
+            rows = search_partitions(conn, sql, query, levels, limit + 1 + offset)
+        except sqlite3.OperationalError:  # Not valid FTS5 syntax -> plain words
+            match = fts_query(query)  # '' (only * / spaces): nothing to search for
+            rows = search_partitions(conn, sql, match, levels, limit + 1 + offset) if match else []
+    rows = rows[offset:offset + limit + 1]
+
+    has_more = len(rows) > limit
+    logs = [{
+        'id': row[0],
+        'level': row[1],
+        'message': payload_codec.decode(row[2]),
+        'tags': json.loads(row[3]) if row[3] else [],
+        'extra': json.loads(payload_codec.decode(row[4])) if row[4] else {},
+        'timestamp': row[5],
+        'created_at': row[6],
+        'snippet': row[7],
+        'rank': row[8]
+    } for row in rows[:limit]]
+    return SearchResponse(query=query, logs=logs, offset=offset,
+                          next_offset=offset + limit if has_more else None, has_more=has_more)
+
+
+def split_filter(value: Optional[str]) -> List[str]:
+    """'a,b' -> ['a', 'b']"""
+    return [item.strip() for item in value.split(',') if item.strip()] if value else []
+
+
+def levels_from(min_level: str) -> List[str]:
+    """min_level=WARNING -> WARNING, ERROR, CRITICAL"""
+    min_level = min_level.upper()
+    if min_level not in LEVEL_ORDER:
+        raise ValueError(f"Unknown level: {min_level}")
+    return LEVEL_ORDER[LEVEL_ORDER.index(min_level):]
+
+
+def created_at_cutoff(delta: timedelta) -> str:
+    """now - delta (Same Format As created_at)"""
+    return (datetime.now(timezone.utc) - delta).strftime(CREATED_AT_FORMAT)
+
+
+def count_logs_since(conn: sqlite3.Connection, cutoff: str) -> int:
+    """Logs Created After cutoff (From Rollups: Full Hours + Minutes Of The First Hour)"""
+    hour, minute = cutoff[:13], cutoff[:16]
+    full_hours = conn.execute(
+        "SELECT IFNULL(SUM(count), 0) FROM log_rollups WHERE period = 'h' AND tag = '' AND bucket > ?",
+        (hour,)).fetchone()[0]
+    first_hour = conn.execute(
+        "SELECT IFNULL(SUM(count), 0) FROM log_rollups WHERE period = 'm' AND tag = '' AND bucket >= ? AND bucket < ?",
+        (minute, hour + '~')).fetchone()[0]
+    return full_hours + first_hour
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(seq: int) -> str:
+    return base64.urlsafe_b64encode(f"v1:{seq}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        version, seq = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split(":")
+        if version != "v1":
+            raise ValueError(version)
+        return int(seq)
+    except ValueError:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+
+
+def query_logs(since: Optional[str] = None, level: Optional[str] = None,
+               limit: int = MAX_LOGS_PER_REQUEST, cursor: Optional[str] = None,
+               order: str = "desc", with_total: bool = False,
+               tags: Optional[str] = None, min_level: Optional[str] = None) -> tuple:
+    """
+    Rows Of One Page -> (rows, next_cursor, has_more, total)
 
+    - Without cursor (order=desc): newest logs first (by timestamp)
+    - With cursor (or order=asc): logs after the cursor in insert order, oldest first.
+      Follow next_cursor to read every log exactly once.
+    - level: one level or a comma separated list / min_level: this level and more severe
+    - tags: logs with any of these tags (comma separated)
+    """
+    query = ("SELECT seq, id, level, message, tags, extra, timestamp, created_at, fingerprint, repeats "
+             "FROM {logs} WHERE TRUE")
+    filters = ""
+    filter_params = []
+
+    # Filter (DAte)
     if since:
-        count_query += " AND timestamp > ?"
-        count_params.append(since)
+        filters += " AND timestamp > ?"
+        filter_params.append(since)
 
-    if level:
-        count_query += " AND level = ?"
-        count_params.append(level.upper())
+    # Filter (Level)
+    levels = [item.upper() for item in split_filter(level)]
+    if min_level:
+        allowed = levels_from(min_level)
+        levels = [item for item in levels if item in allowed] if levels else allowed
+    if level or min_level:
+        filters += f" AND level IN ({','.join('?' * len(levels))})"
+        filter_params += levels
+
+    # Filter (Tags, log_tags Index)
+    tag_list = split_filter(tags)
+    if tag_list:
+        filters += f" AND seq IN (SELECT log_seq FROM {{log_tags}} WHERE tag IN ({','.join('?' * len(tag_list))}))"
+        filter_params += tag_list
+
+    ascending = cursor is not None or order == "asc"
+    after = decode_cursor(cursor) if cursor else 0
+    query += filters
+
+    started = time.perf_counter()
+    with db.snapshot() as conn:
+        # Read before the page: a short page means every log up to here was checked (filtered out or returned)
+        scanned_seq = last_log_seq(conn)
+        partitions = log_partitions(conn)
+        rows = []
+        if ascending:
+            # Partitions hold increasing seq ranges: skip the ones read before, stop when the page is full
+            for key, _, last_seq, _, _, max_timestamp in partitions:
+                if last_seq <= after or (since and max_timestamp <= since):  # No log after since
+                    continue
+                logs, log_tags, *_ = partition_tables(key)
+                rows += conn.execute(query.format(logs=logs, log_tags=log_tags) + " AND seq > ? ORDER BY seq LIMIT ?",
+                                     filter_params + [after, limit - len(rows)]).fetchall()
+                if len(rows) == limit:
+                    break
+        else:
+            # timestamp is set by the client: partitions by their newest timestamp, until none left can beat the page
+            for key, *_, max_timestamp in sorted(partitions, key=lambda partition: partition[5], reverse=True):
+                if (since and max_timestamp <= since) or (len(rows) == limit and max_timestamp < (rows[-1][6] or "")):
+                    break
+                logs, log_tags, *_ = partition_tables(key)
+                rows = heapq.nlargest(limit, rows + conn.execute(
+                    query.format(logs=logs, log_tags=log_tags) + " ORDER BY timestamp DESC LIMIT ?",
+                    filter_params + [limit]).fetchall(), key=lambda row: row[6] or "")
+    metrics.get_logs.observe(time.perf_counter() - started)
+
+    # Next Cursor (Newest Row Seen, Skips Filtered Logs)
+    has_more = ascending and len(rows) == limit
+    if ascending and not has_more:
+        next_cursor = encode_cursor(max([after, scanned_seq] + [row[0] for row in rows]))
+    elif rows:
+        next_cursor = encode_cursor(max(row[0] for row in rows))
+    else:
+        next_cursor = None
+
+    # Count All Logs (Opt-in: Partition Counts, COUNT(*) Only Where Some Logs Of A Partition Are Filtered Out)
+    total = None
+    if with_total:
+        only_since = not (level or min_level or tag_list)
+        total = 0
+        with db.snapshot() as conn:
+            for key, _, _, count, min_timestamp, max_timestamp in log_partitions(conn):
+                if since and max_timestamp <= since:
+                    continue
+                if only_since and (not since or min_timestamp > since):  # Every log of the partition matches
+                    total += count
+                    continue
+                logs, log_tags, *_ = partition_tables(key)
+                total += conn.execute(f"SELECT COUNT(*) FROM {logs} WHERE TRUE" + filters.format(log_tags=log_tags),
+                                      filter_params).fetchone()[0]
+
+    return rows, next_cursor, has_more, total
+
+
+def row_to_log(row: tuple, with_cursor: bool = False) -> dict:
+    """query_logs Row -> Log"""
+    log = {
+        'id': row[1],
+        'level': row[2],
+        'message': payload_codec.decode(row[3]),
+        'tags': json.loads(row[4]) if row[4] else [],
+        'extra': json.loads(payload_codec.decode(row[5])) if row[5] else {},
+        'timestamp': row[6],
+        'created_at': row[7],
+        'fingerprint': row[8],
+        'repeats': row[9]
+    }
+    if with_cursor:
+        log['cursor'] = encode_cursor(row[0])
+    return log
 
-    cursor.execute(count_query, count_params)
-    total = cursor.fetchone()[0]
 
-    conn.close()
+def get_logs(since: Optional[str] = None, level: Optional[str] = None,
+             limit: int = MAX_LOGS_PER_REQUEST, cursor: Optional[str] = None,
+             order: str = "desc", with_total: bool = False, with_cursors: bool = False,
+             tags: Optional[str] = None, min_level: Optional[str] = None) -> LogResponse:
+    """
+    Get Logs (query_logs As LogResponse)
 
-    return LogResponse(logs=logs, total=total, since=since)
+    - with_cursors: add the cursor of every log (SSE event ids)
+    """
+    rows, next_cursor, has_more, total = query_logs(since=since, level=level, limit=limit, cursor=cursor,
+                                                    order=order, with_total=with_total, tags=tags,
+                                                    min_level=min_level)
+    return LogResponse(logs=[row_to_log(row, with_cursors) for row in rows], total=total, since=since,
+                       next_cursor=next_cursor, has_more=has_more)
+
+
+def json_value(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, str):
+        return encode_json_string(value)
+    return json.dumps(value)
+
+
+def row_to_json(row: tuple, columnar: bool = False, with_cursor: bool = False) -> str:
+    """query_logs Row -> JSON Text (tags / extra Are Copied As Stored, Not Parsed)"""
+    values = (json_value(row[1]), json_value(row[2]), json_value(payload_codec.decode(row[3])),
+              row[4] or "[]", payload_codec.decode(row[5]) or "{}", json_value(row[6]), json_value(row[7]),
+              json_value(row[8]), json_value(row[9]))
+    if columnar:
+        return f"[{','.join(values)}]"
+    text = ",".join(f'"{column}":{value}' for column, value in zip(LOG_COLUMNS, values))
+    if with_cursor:
+        text += f',"cursor":"{encode_cursor(row[0])}"'
+    return "{" + text + "}"
 
 
 def cleanup_old_logs(days: int = 30, seconds: int = None):
-    """Delete Older Logs"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    """
+    Drop Partitions Older Than The Cutoff
 
+    Whole partitions only (DROP TABLE, no per-row deletes): logs are kept up to one partition (LOG_PARTITION)
+    longer than asked.
+    """
     if seconds:
-        cutoff_date = (datetime.now() - timedelta(seconds=seconds)).isoformat()
+        cutoff_date = created_at_cutoff(timedelta(seconds=seconds))
     else:
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-    cursor.execute("DELETE FROM logs WHERE created_at < ?", (cutoff_date,))
+        cutoff_date = created_at_cutoff(timedelta(days=days))
+    started = time.perf_counter()
+    with db.write() as conn:
+        deleted_count = 0
+        for key, _, _, count, *_ in log_partitions(conn):
+            if key < cutoff_date[:len(key)]:  # Every log of the partition is older
+                drop_partition(conn, key)
+                deleted_count += count
+
+        conn.execute("DELETE FROM issues WHERE last_seen < ?", (cutoff_date,))
+
+        # Old per-minute counters
+        minute_cutoff = created_at_cutoff(timedelta(days=ROLLUP_MINUTE_DAYS))[:16]
+        conn.execute("DELETE FROM log_rollups WHERE period = 'm' AND bucket < ?", (minute_cutoff,))
+
+    metrics.cleanup.observe(time.perf_counter() - started)
+    return deleted_count
 
-    deleted_count = cursor.rowcount
-    conn.commit()
-    conn.close()
 
-    return deleted_count
+def build_log_row(log_entry: LogEntry, log_id: Optional[str] = None) -> tuple:
+    """LogEntry -> Row (INSERT_LOG_SQL)"""
+    log_id = log_id or str(uuid.uuid4())
+    timestamp = log_entry.timestamp or datetime.now().isoformat()
+    tags_json = json.dumps(log_entry.tags) if log_entry.tags else "[]"
+    extra_json = json.dumps(log_entry.extra) if log_entry.extra else "{}"
+    fingerprint = log_fingerprint(log_entry.level, log_entry.message, log_entry.tags)
+    return (log_id, log_entry.level.upper(), payload_codec.encode(log_entry.message), tags_json,
+            payload_codec.encode(extra_json), timestamp, fingerprint)
+
+
+def train_dictionary(samples: int = DICT_SAMPLES) -> Optional[int]:
+    """New Compression Dictionary From Recent Large Payloads (Repeated Lines / JSON Parts, Most Common Last)"""
+    rows = []
+    with db.snapshot() as conn:
+        for key, *_ in reversed(log_partitions(conn)):
+            rows += conn.execute(f'''
+                SELECT message, extra FROM {partition_tables(key)[0]}
+                WHERE typeof(message) = 'blob' OR typeof(extra) = 'blob' OR length(message) >= ?1 OR length(extra) >= ?1
+                ORDER BY seq DESC LIMIT ?2
+            ''', (max(payload_codec.min_bytes, 1), samples - len(rows))).fetchall()
+            if len(rows) >= samples:
+                break
+
+    parts = Counter()
+    for row in rows:
+        for value in row:
+            text = payload_codec.decode(value) or ""
+            if len(text) >= payload_codec.min_bytes:
+                parts.update(set(re.split(r'(?<=[\n,{}])', text)))
+
+    # Parts seen in many payloads save the most; zlib finds the end of the dictionary fastest
+    chosen, size = [], 0
+    for part, count in sorted(parts.items(), key=lambda item: item[1] * len(item[0]), reverse=True):
+        if count < 2 or size + len(part.encode()) > DICT_MAX_BYTES:
+            continue
+        chosen.append(part)
+        size += len(part.encode())
+    if not chosen:
+        return None
+
+    with db.write() as conn:
+        dict_id = conn.execute("INSERT INTO compression_dicts (data) VALUES (?)",
+                               ("".join(reversed(chosen)).encode(),)).lastrowid
+        payload_codec.load(conn)
+    return dict_id
+
+
+def recompress_logs(train: bool = False, chunk_size: int = BATCH_CHUNK_SIZE) -> int:
+    """Migration: Compress / Recompress Stored Rows With The Current Settings (Small Transactions)"""
+    if train:
+        dict_id = train_dictionary()
+        print(f"Dictionary: {dict_id if dict_id else 'not enough repeated data'}")
+
+    with db.read() as conn:
+        keys = [key for key, *_ in log_partitions(conn)]
+
+    changed = 0
+    for key in keys:
+        logs, after = partition_tables(key)[0], 0
+        while True:
+            with db.write() as conn:
+                if not table_exists(conn, logs):  # Dropped meanwhile (cleanup)
+                    break
+                rows = conn.execute(f"SELECT seq, message, extra FROM {logs} WHERE seq > ? ORDER BY seq LIMIT ?",
+                                    (after, chunk_size)).fetchall()
+                if not rows:
+                    break
+                updates = []
+                for seq, message, extra in rows:
+                    new_message = payload_codec.encode(payload_codec.decode(message))
+                    new_extra = payload_codec.encode(payload_codec.decode(extra)) if extra is not None else None
+                    if new_message != message or new_extra != extra:
+                        updates.append((new_message, new_extra, seq))
+                conn.executemany(f"UPDATE {logs} SET message = ?, extra = ? WHERE seq = ?", updates)
+                changed += len(updates)
+                after = rows[-1][0]
+    return changed
+
+
+def accepted_encodings(request: Request) -> set:
+    """Accept-Encoding: gzip, br;q=0.5 -> {'gzip', 'br'}"""
+    encodings = set()
+    for item in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = item.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            encodings.add(name.lower())
+    return encodings
+
+
+def encode_response(request: Request, body: bytes, media_type: str) -> Response:
+    """Compress With brotli / gzip If The Client Accepts It"""
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= RESPONSE_COMPRESS_MIN_BYTES:
+        encodings = accepted_encodings(request)
+        if brotli is not None and "br" in encodings:
+            body, headers["Content-Encoding"] = brotli.compress(body, quality=4), "br"
+        elif "gzip" in encodings:
+            body, headers["Content-Encoding"] = gzip.compress(body, compresslevel=5), "gzip"
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def render_logs(request: Request, page: tuple, since: Optional[str] = None,
+                response_format: str = "json") -> Response:
+    """
+    query_logs Page -> Response (Body Built Directly, No Response Model Validation)
+
+    - json: LogResponse
+    - columnar: `columns` once + `rows` (lists) instead of `logs`
+    - msgpack: columnar, as MessagePack
+    """
+    rows, next_cursor, has_more, total = page
+    if response_format == "msgpack":
+        data = {"total": total, "since": since, "next_cursor": next_cursor, "has_more": has_more,
+                "columns": LOG_COLUMNS,
+                "rows": [[log[column] for column in LOG_COLUMNS] for log in map(row_to_log, rows)]}
+        return encode_response(request, msgpack.packb(data), "application/x-msgpack")
+
+    columnar = response_format == "columnar"
+    head = f'{{"columns":{json.dumps(LOG_COLUMNS)},"rows":[' if columnar else '{"logs":['
+    body = (head + ",".join(row_to_json(row, columnar) for row in rows) +
+            f'],"total":{json_value(total)},"since":{json_value(since)},'
+            f'"next_cursor":{json_value(next_cursor)},"has_more":{json_value(has_more)}}}')
+    return encode_response(request, body.encode(), "application/json")
+
+
+def newest_seq() -> int:
+    """Newest Committed seq (Also Logs Written By Other Processes)"""
+    with db.read() as conn:
+        return last_log_seq(conn)
+
+
+async def wait_for_logs(after_seq: int, timeout: float) -> int:
+    """Wait Until A Log Newer Than after_seq Is Committed -> Newest seq (== after_seq: Timeout)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        seq = log_notifier.last_seq
+        if seq <= after_seq:  # Other processes: one log_sequence read, not a page query
+            seq = await run_in_threadpool(newest_seq)
+        remaining = deadline - time.monotonic()
+        if seq > after_seq or remaining <= 0:
+            return max(seq, after_seq)
+        await log_notifier.wait(after_seq, min(remaining, STREAM_POLL_INTERVAL))
 
 
 class LoggerAPI:
     def __init__(self):
         init_database()
+        self.writer = LogWriterClient(LOG_WRITER_SOCKET, LOG_WRITER_AUTHKEY) if LOG_WRITER_SOCKET else None
 
     def add_log(self, log_entry: LogEntry):  # noqa
         """New Log"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        row = build_log_row(log_entry)
+        self.add_rows([row])
+        return row[0]
+
+    def add_rows(self, rows: List[tuple]):  # noqa
+        """New Logs (One Transaction, In The Writer Process When There Is One)"""
+        started = time.perf_counter()
+        try:
+            if self.writer is not None:
+                new_seq = self.writer.add_rows(rows)
+            else:
+                new_seq = self.write_rows(rows)
+        except Exception:
+            metrics.count_errors(len(rows))
+            raise
+        metrics.add_log.observe(time.perf_counter() - started)
+        log_notifier.notify(new_seq)
+
+    def write_rows(self, rows: List[tuple]) -> int:  # noqa
+        """Insert Into This Process's Database Connection -> Newest seq"""
+        with db.write() as conn:
+            rows = update_issues(conn, rows)
+            new_seq = insert_logs(conn, rows)
+            metrics.count_levels(rows)
+        return new_seq
+
+    def cleanup(self, days: int = 30, seconds: int = None) -> int:
+        """cleanup_old_logs (In The Writer Process When There Is One)"""
+        if self.writer is not None:
+            return self.writer.call('cleanup', days, seconds)
+        return cleanup_old_logs(days, seconds)
+
+
+class LogBufferClosed(RuntimeError):
+    pass
+
+
+class LogBuffer:
+    """Write-Behind Queue (Background Writer -> executemany)"""
+    POLICIES = ('block', 'drop_debug', 'drop_oldest')
+
+    def __init__(self, api: LoggerAPI, max_size: int = LOG_BUFFER_SIZE, flush_size: int = LOG_FLUSH_SIZE,
+                 flush_interval: float = LOG_FLUSH_INTERVAL, overflow_policy: str = LOG_OVERFLOW_POLICY):
+        if overflow_policy not in self.POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.api = api
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._first_put = None  # monotonic time of the oldest queued log
+        self._queued = 0  # Sequence numbers (flush() waits on these)
+        self._written = 0
+        self._flush_requested = False
+        self._closed = False
+
+        self.dropped = 0
+        self.failed = 0
+
+        self._thread = threading.Thread(target=self._run, name="LogBufferWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        metrics.buffers.add(self)
+
+    def put(self, row: tuple) -> bool:
+        """Queue A Row (False == Dropped)"""
+        with self._cond:
+            if self._closed:
+                raise LogBufferClosed("LogBuffer is closed")
+
+            while len(self._queue) >= self.max_size:
+                if self.overflow_policy == 'drop_oldest':
+                    self._queue.popleft()
+                    self._written += 1
+                    self.dropped += 1
+                elif self.overflow_policy == 'drop_debug' and row[1] == 'DEBUG':
+                    self.dropped += 1
+                    return False
+                elif self.overflow_policy == 'drop_debug' and self._evict_debug():
+                    continue
+                else:
+                    self._flush_requested = True
+                    self._cond.notify_all()
+                    self._cond.wait()
+                    if self._closed:
+                        raise LogBufferClosed("LogBuffer is closed")
+
+            self._queue.append(row)
+            self._queued += 1
+            if self._first_put is None:
+                self._first_put = time.monotonic()
+            if len(self._queue) >= self.flush_size:
+                self._cond.notify_all()
+            return True
+
+    def _evict_debug(self) -> bool:
+        """Free A Slot (Oldest Queued DEBUG Log)"""
+        for i, queued in enumerate(self._queue):
+            if queued[1] == 'DEBUG':
+                del self._queue[i]
+                self._written += 1
+                self.dropped += 1
+                return True
+        return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait Until Everything Queued So Far Is Written"""
+        with self._cond:
+            target = self._queued
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._written >= target or not self._thread.is_alive(), timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Drain And Stop Writer"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def _due(self) -> bool:
+        if not self._queue:
+            return False
+        if self._closed or self._flush_requested or len(self._queue) >= self.flush_size:
+            return True
+        return time.monotonic() - self._first_put >= self.flush_interval
+
+    def _run(self):
+        retries = 0
+        while True:
+            with self._cond:
+                while not self._due():
+                    if self._closed and not self._queue:
+                        return
+                    timeout = None
+                    if self._queue:
+                        timeout = max(0.0, self.flush_interval - (time.monotonic() - self._first_put))
+                    self._cond.wait(timeout)
+
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.flush_size))]
+                if self._queue:
+                    self._first_put = time.monotonic()
+                else:
+                    self._first_put = None
+                    self._flush_requested = False
+                self._cond.notify_all()  # Wake blocked producers
+
+            try:
+                self.api.add_rows(batch)
+                retries = 0
+            except sqlite3.OperationalError as e:
+                # database is locked -> Retry next round
+                if retries < 3:
+                    retries += 1
+                    with self._cond:
+                        self._queue.extendleft(reversed(batch))
+                        self._first_put = self._first_put or time.monotonic()
+                    time.sleep(0.1 * retries)
+                    continue
+                retries = 0
+                self._lost(batch, e)
+            except Exception as e:  # noqa
+                self._lost(batch, e)
+
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+
+
+    def _lost(self, batch: List[tuple], error: Exception):
+        """Failed Batch: Counted + One Line On stderr"""
+        self.failed += len(batch)
+        print(f"LogBuffer: {len(batch)} logs not written: {type(error).__name__}: {error}", file=sys.stderr)
+
+
+class LogWriterError(Exception):
+    pass
+
+
+class LogWriterServer:
+    """Single Writer Process: Rows From All Workers -> One Queue -> Group Commits"""
+
+    def __init__(self, api: LoggerAPI, address: str, authkey: bytes, batch_size: int = LOG_WRITER_BATCH):
+        self.api = api
+        self.address = address
+        self.authkey = authkey
+        self.batch_size = batch_size
+        self._queue = queue.Queue()  # (rows, connection)
+
+    def serve(self, ready=None):
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        listener = Listener(self.address, family='AF_UNIX', authkey=self.authkey)
+        threading.Thread(target=self._commit_loop, name="LogWriterCommit", daemon=True).start()
+        if ready is not None:
+            ready.set()
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError):  # Failed handshake
+                continue
+            threading.Thread(target=self._handle, args=(conn,), name="LogWriterConnection", daemon=True).start()
+
+    def _handle(self, conn):
+        """One Worker Connection (One Request At A Time)"""
+        with conn:
+            while True:
+                try:
+                    command, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if command == 'add_rows':
+                    self._queue.put((args[0], conn))  # Answered by _commit_loop
+                    continue
+                try:
+                    if command == 'cleanup':
+                        conn.send(('ok', cleanup_old_logs(*args)))
+                    elif command == 'metrics':
+                        conn.send(('ok', self.metrics()))
+                    else:
+                        conn.send(('error', f"Unknown command: {command}"))
+                except Exception as e:
+                    conn.send(('error', str(e)))
+
+    def metrics(self) -> Dict[str, tuple]:
+        """Writer Families For The Worker That Answers /metrics"""
+        families = metrics.families('process="writer"')
+        families["loggram_writer_queue_depth"] = ("gauge", "Write requests waiting for a group commit",
+                                                  [f'loggram_writer_queue_depth{{process="writer"}} {self._queue.qsize()}'])
+        return families
+
+    def _commit_loop(self):
+        while True:
+            requests = [self._queue.get()]
+            size = len(requests[0][0])
+            while size < self.batch_size:
+                try:
+                    request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                requests.append(request)
+                size += len(request[0])
+
+            try:
+                new_seq = self.api.write_rows([row for rows, _ in requests for row in rows])
+                replies = [(conn, ('ok', new_seq)) for _, conn in requests]
+            except Exception:
+                # One bad request (e.g. duplicate id) must not fail the others
+                replies = []
+                for rows, conn in requests:
+                    try:
+                        replies.append((conn, ('ok', self.api.write_rows(rows))))
+                    except Exception as e:
+                        replies.append((conn, ('error', str(e))))
+
+            for conn, reply in replies:
+                try:
+                    conn.send(reply)
+                except (OSError, ValueError):  # Worker gone
+                    pass
+
+
+class LogWriterClient:
+    """Worker Side Of LogWriterServer (Pool Of Connections, One Request Per Connection At A Time)"""
+
+    def __init__(self, address: str, authkey: bytes, connections: int = LOG_WRITER_CONNECTIONS):
+        self.address = address
+        self.authkey = authkey
+        self._idle = []  # Connected, not in use
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(connections, 1))
+
+    def call(self, command: str, *args):
+        return self._call(command, args)
+
+    def add_rows(self, rows: List[tuple]) -> int:
+        return self._call('add_rows', (rows,))  # Levels are counted by the writer
+
+    def _connect(self):
+        deadline = time.monotonic() + LOG_WRITER_RESTART_WAIT
+        while True:
+            try:
+                return Client(self.address, family='AF_UNIX', authkey=self.authkey)
+            except OSError:  # Writer restarting (LogWriterProcess)
+                if time.monotonic() > deadline:
+                    raise LogWriterError("Log writer unavailable: no connection")
+                time.sleep(0.1)
+
+    def _call(self, command: str, args: tuple):
+        with self._slots:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            try:
+                if conn is None:
+                    conn = self._connect()
+                conn.send((command, args))
+            except (OSError, EOFError):  # Writer restarted -> Reconnect once (nothing was sent)
+                if conn is not None:
+                    conn.close()
+                conn = self._connect()
+                conn.send((command, args))
+            try:
+                status, value = conn.recv()
+            except (OSError, EOFError) as e:
+                conn.close()
+                raise LogWriterError(f"Log writer unavailable: {str(e)}")
+            with self._lock:
+                self._idle.append(conn)
+        if status != 'ok':
+            raise LogWriterError(value)
+        return value
+
+
+def run_log_writer(address: str, authkey: bytes, ready=None):
+    """Writer Process Entry (Spawned By __main__)"""
+    logger_api.writer = None  # This process writes
+    LogWriterServer(logger_api, address, authkey).serve(ready)
+
+
+class LogWriterProcess:
+    """Writer Process Of __main__ + Environment For The uvicorn Workers (Restarted If It Dies)"""
+
+    def __init__(self, check_interval: float = 1.0):
+        self.address = os.path.join(tempfile.gettempdir(), f"loggram-{PROJECT_NAME}-{os.getpid()}.sock")
+        self.authkey = os.urandom(16)
+        self.check_interval = check_interval
+        self.process = None
+        self.restarts = 0
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._spawn()
+        os.environ['LOG_WRITER_SOCKET'] = self.address
+        os.environ['LOG_WRITER_AUTHKEY'] = self.authkey.hex()
+        threading.Thread(target=self._watch, name="LogWriterWatch", daemon=True).start()
+
+    def stop(self):
+        with self._lock:
+            self._stopped.set()
+            self.process.terminate()
+        if os.path.exists(self.address):
+            os.remove(self.address)
+
+    def _spawn(self):
+        context = multiprocessing.get_context("spawn")  # Fresh SQLite connections
+        ready = context.Event()
+        process = context.Process(target=run_log_writer, args=(self.address, self.authkey, ready),
+                                  name="LogWriter", daemon=True)
+        process.start()
+        self.process = process
+        if not ready.wait(30):
+            process.terminate()
+            raise RuntimeError("Log writer did not start")
+
+    def _watch(self):
+        """Same Socket And Key: Workers Reconnect On Their Next Request"""
+        while not self._stopped.wait(self.check_interval):
+            with self._lock:
+                if self._stopped.is_set() or self.process.is_alive():
+                    continue
+                print(f"Log writer exited ({self.process.exitcode}), restarting", file=sys.stderr)
+                try:
+                    self._spawn()
+                    self.restarts += 1
+                except RuntimeError as e:  # Next check tries again
+                    print(str(e), file=sys.stderr)
+
+
+class BatchFormatError(ValueError):
+    pass
+
+
+def _validate_batch_entry(value) -> LogEntry:
+    if not isinstance(value, dict):
+        raise ValueError("Entry must be a JSON object")
+    try:
+        return LogEntry.model_validate(value)
+    except ValidationError as e:
+        raise ValueError("; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+
+
+async def iter_ndjson(chunks):
+    """Streamed NDJSON Body -> (value, error)"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _decode_ndjson_line(line)
+        if len(buffer) > MAX_BATCH_ENTRY_BYTES:
+            yield None, "Entry too large"
+            return
+    if buffer.strip():
+        yield _decode_ndjson_line(buffer)
+
+
+def _decode_ndjson_line(line: bytes):
+    try:
+        return json.loads(line), None
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
 
-        log_id = str(uuid.uuid4())
-        timestamp = log_entry.timestamp or datetime.now().isoformat()
-        tags_json = json.dumps(log_entry.tags) if log_entry.tags else "[]"
-        extra_json = json.dumps(log_entry.extra) if log_entry.extra else "{}"
 
-        cursor.execute('''
-            INSERT INTO logs (id, level, message, tags, extra, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (log_id, log_entry.level.upper(), log_entry.message, tags_json, extra_json, timestamp))
+def _incomplete_json(error: json.JSONDecodeError) -> bool:
+    """Failed Only Because The Data Ends Here (The Next Chunk Could Complete It)"""
+    return error.msg.startswith("Unterminated string") or error.pos >= len(error.doc) - 6  # Longest: \uXXXX
+
+
+async def _chunks_then_end(chunks):
+    async for chunk in chunks:
+        yield chunk
+    yield None
 
-        conn.commit()
-        conn.close()
 
-        return log_id
+async def iter_json_array(chunks):
+    """
+    Streamed JSON Array Body -> (value, error) (One Entry In Memory At A Time)
+
+    Invalid JSON (bad entry, missing or extra comma, data after the array) -> BatchFormatError
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ""
+    expect = "["  # "[" -> "first" (entry or "]") -> "," (or "]") -> "entry" -> "," ... -> "end"
+
+    async for chunk in _chunks_then_end(chunks):
+        ended = chunk is None
+        try:
+            buffer += text_decoder.decode(chunk or b"", final=ended)
+        except UnicodeDecodeError:
+            raise BatchFormatError("Invalid UTF-8")
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            char = buffer[pos]
+
+            if expect == "[":
+                if char != "[":
+                    raise BatchFormatError("Body must be a JSON array")
+                expect, pos = "first", pos + 1
+                continue
+            if expect == "end":
+                raise BatchFormatError("Invalid JSON: data after the array")
+            if char == "]" and expect in ("first", ","):
+                expect, pos = "end", pos + 1
+                continue
+            if expect == ",":
+                if char != ",":
+                    raise BatchFormatError("Invalid JSON: expecting ',' between entries")
+                expect, pos = "entry", pos + 1
+                continue
+
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if ended or not _incomplete_json(e):
+                    raise BatchFormatError(f"Invalid JSON: {e.msg}")
+                if len(buffer) - pos > MAX_BATCH_ENTRY_BYTES:
+                    yield None, "Entry too large"
+                    return
+                break  # Incomplete -> Wait for more data
+            if not ended and isinstance(value, (int, float)) and not buffer[end:].strip("0123456789.eE+-"):
+                break  # The number could go on in the next chunk
+            yield value, None
+            expect, pos = ",", end
+
+        buffer = buffer[pos:]
+
+    if expect == "[":
+        raise BatchFormatError("Body must be a JSON array")
+    if expect != "end":
+        raise BatchFormatError("Invalid JSON: unterminated array")
 
 
 logger_api = LoggerAPI()
@@ -186,32 +1803,144 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "Get Logs": "/logs",
+            "Stream New Logs (SSE)": "/logs/stream",
+            "Search Logs": "/logs/search",
+            "Repeated Logs (Issues)": "/issues",
             "Add Logs (POST)": "/logs",
+            "Add Logs In Batch (POST)": "/logs/batch",
             "Delete Older Logs": "/cleanup",
-            "Stats Logs": "/stats"
+            "Stats Logs": "/stats",
+            "Metrics (Prometheus)": "/metrics"
         }
     }
 
 
 @app.get("/logs", response_model=LogResponse, summary="Get Logs")
 async def get_logs_route(
+        request: Request,
         since: Optional[str] = Query(None, description="Get Log Order By Date"),
-        level: Optional[str] = Query(None, description="Get Log Order By Level"),
-        limit: int = Query(50, description="Maximum Logs", le=MAX_LOGS_PER_REQUEST)
+        level: Optional[str] = Query(None, description="Get Log Order By Level (Comma Separated)"),
+        min_level: Optional[str] = Query(None, description="This Level And More Severe Levels"),
+        tags: Optional[str] = Query(None, description="Logs With Any Of These Tags (Comma Separated)"),
+        limit: int = Query(50, description="Maximum Logs", le=MAX_LOGS_PER_REQUEST),
+        cursor: Optional[str] = Query(None, description="Get Logs After This Cursor (next_cursor)"),
+        order: str = Query("desc", description="desc (newest first) or asc (insert order)", pattern="^(asc|desc)$"),
+        with_total: bool = Query(False, description="Count All Matching Logs (Slow)"),
+        wait: float = Query(0, description="Wait Up To This Many Seconds For New Logs", ge=0, le=MAX_WAIT_SECONDS),
+        response_format: str = Query("json", alias="format", description="json, columnar or msgpack",
+                                     pattern="^(json|columnar|msgpack)$")
 ):
     """
     Get Logs With Filter
 
     - **since**: Start Date (ISO format)
-    - **level**: Level Log (ERROR, WARNING, INFO, DEBUG, SUCCESS)
+    - **level**: Level Log (ERROR, WARNING, INFO, DEBUG, SUCCESS), or a list: `ERROR,CRITICAL`
+    - **min_level**: `WARNING` == WARNING, ERROR, CRITICAL
+    - **tags**: Logs with any of these tags: `payment,auth`
     - **limit**: Maximum Logs (Default: 50)
+    - **cursor**: Continue from `next_cursor` of the previous page (oldest first)
+    - **order**: `asc` starts reading from the oldest log
+    - **with_total**: Include `total` (exact count)
+    - **wait**: Long-poll: if there are no logs, wait up to this many seconds for new ones
+    - **format**: `columnar` (keys once) or `msgpack` (columnar JSON without the msgpack package); gzip / brotli via Accept-Encoding
     """
+    if response_format == "msgpack" and msgpack is None:  # Same data as JSON (clients check Content-Type)
+        response_format = "columnar"
     try:
-        return get_logs(since=since, level=level, limit=limit)
+        deadline = time.monotonic() + wait
+        checked_seq = await run_in_threadpool(newest_seq) if wait else 0  # Read before the query
+        while True:
+            page = await run_in_threadpool(query_logs, since=since, level=level, limit=limit, cursor=cursor,
+                                           order=order, with_total=with_total, tags=tags, min_level=min_level)
+            remaining = deadline - time.monotonic()
+            if page[0] or remaining <= 0:
+                return render_logs(request, page, since, response_format)
+            seq = await wait_for_logs(checked_seq, remaining)
+            if seq == checked_seq:  # Nothing new: no second query
+                return render_logs(request, page, since, response_format)
+            checked_seq = seq
+    except ValueError as e:  # InvalidCursorError / Unknown level
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error Fetching: {str(e)}")
 
 
+@app.get("/logs/stream", summary="Stream New Logs (SSE)")
+async def stream_logs_route(
+        request: Request,
+        cursor: Optional[str] = Query(None, description="Start After This Cursor (Default: New Logs Only)"),
+        level: Optional[str] = Query(None, description="Get Log Order By Level (Comma Separated)"),
+        min_level: Optional[str] = Query(None, description="This Level And More Severe Levels"),
+        tags: Optional[str] = Query(None, description="Logs With Any Of These Tags (Comma Separated)")
+):
+    """
+    Server-Sent Events: every new log is sent as an `event: log` with its cursor as the event `id`
+
+    - **cursor**: Start after this cursor (reconnects use the `Last-Event-ID` header)
+    - **level** / **min_level** / **tags**: Same filters as `/logs`
+    """
+    cursor = request.headers.get("last-event-id") or cursor
+    try:
+        if cursor:
+            checked_seq = decode_cursor(cursor)
+        else:  # From the database: also logs written by other processes are "before connecting"
+            checked_seq = await run_in_threadpool(newest_seq)
+        cursor = encode_cursor(checked_seq)
+        if min_level:
+            levels_from(min_level)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def events():
+        nonlocal cursor, checked_seq  # checked_seq: every log up to here was queried
+        last_sent = time.monotonic()
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            seq = await wait_for_logs(checked_seq, STREAM_POLL_INTERVAL)
+            if seq > checked_seq:
+                rows, cursor, has_more, _ = await run_in_threadpool(
+                    query_logs, level=level, cursor=cursor, limit=MAX_LOGS_PER_REQUEST, tags=tags,
+                    min_level=min_level)
+                for row in rows:
+                    yield f"id: {encode_cursor(row[0])}\nevent: log\ndata: {row_to_json(row, with_cursor=True)}\n\n"
+                    last_sent = time.monotonic()
+                if has_more:
+                    continue
+                checked_seq = seq
+
+            if time.monotonic() - last_sent >= STREAM_HEARTBEAT:
+                yield ": ping\n\n"
+                last_sent = time.monotonic()
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.get("/logs/search", response_model=SearchResponse, summary="Search Logs")
+async def search_logs_route(
+        q: str = Query(..., min_length=1, description="Words To Search (message + extra)"),
+        level: Optional[str] = Query(None, description="Get Log Order By Level (Comma Separated)"),
+        min_level: Optional[str] = Query(None, description="This Level And More Severe Levels"),
+        limit: int = Query(20, description="Maximum Logs", ge=1, le=MAX_LOGS_PER_REQUEST),
+        offset: int = Query(0, description="Skip This Many Results (next_offset)", ge=0)
+):
+    """
+    Full-Text Search, Best Match First
+
+    - **q**: Words (all must match), `pay*` for a prefix, or FTS5 syntax: `timeout OR refused`
+    - **level** / **min_level**: Same filters as `/logs`
+    - **limit** / **offset**: Pages (`next_offset`)
+    """
+    if not db.search:
+        raise HTTPException(status_code=501, detail="Search is disabled (LOG_SEARCH=0 or SQLite without FTS5)")
+    try:
+        return search_logs(q, limit=limit, offset=offset, level=level, min_level=min_level)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error Searching: {str(e)}")
+
+
 @app.post("/logs", summary="Add New Logs")
 async def add_log_route(log_entry: LogEntry):
     """
@@ -223,7 +1952,7 @@ async def add_log_route(log_entry: LogEntry):
     - **extra**: Extra Content (JSON)
     """
     try:
-        log_id = logger_api.add_log(log_entry)
+        log_id = await run_in_threadpool(logger_api.add_log, log_entry)  # Keeps the event loop free
         return {
             "success": True,
             "log_id": log_id,
@@ -233,44 +1962,162 @@ async def add_log_route(log_entry: LogEntry):
         raise HTTPException(status_code=500, detail=f"Error Fetching Log: {str(e)}")
 
 
-@app.get("/stats", summary="Stats Logs")
-async def get_stats_route():
+@app.post("/logs/batch", summary="Add New Logs (Batch)")
+async def add_logs_batch_route(request: Request):
+    """
+    Add Many Logs In One Request
+
+    - **Body**: JSON array of logs, or one log per line (`Content-Type: application/x-ndjson`)
+    - Logs are validated one by one and saved in chunks of `BATCH_CHUNK_SIZE`
+    - Response has a `log_id` or an `error` for every entry (by index)
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        entries = iter_ndjson(request.stream())
+    else:
+        entries = iter_json_array(request.stream())
+
+    results = []
+    pending = []  # (index, row)
+    inserted = 0
+
+    async def flush_pending():
+        nonlocal inserted
+        try:
+            await run_in_threadpool(logger_api.add_rows, [row for _, row in pending])
+            results.extend({"index": index, "log_id": row[0]} for index, row in pending)
+            inserted += len(pending)
+        except Exception as e:
+            results.extend({"index": index, "error": f"Error Saving Log: {str(e)}"} for index, _ in pending)
+        pending.clear()
+
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        index = 0
+        async for value, error in entries:
+            if index >= MAX_LOGS_PER_BATCH:
+                results.append({"index": index, "error": f"Batch limit ({MAX_LOGS_PER_BATCH}) exceeded"})
+                break
+            if error is None:
+                try:
+                    pending.append((index, build_log_row(_validate_batch_entry(value))))
+                except ValueError as e:
+                    error = str(e)
+            if error is not None:
+                results.append({"index": index, "error": error})
+            if len(pending) >= BATCH_CHUNK_SIZE:
+                await flush_pending()
+            index += 1
+    except BatchFormatError as e:
+        if not inserted:  # Nothing saved yet: reject the whole body
+            pending.clear()
+            raise HTTPException(status_code=400, detail=f"{e} (entry {index})" if index else str(e))
+        results.append({"index": index, "error": f"{e}; this entry and the rest of the body were not processed"})
+    finally:
+        if pending:
+            await flush_pending()
+
+    results.sort(key=lambda result: result["index"])
+    return {
+        "success": inserted == len(results),
+        "inserted": inserted,
+        "failed": len(results) - inserted,
+        "results": results
+    }
 
-        cursor.execute("SELECT COUNT(*) FROM logs")
-        total_logs = cursor.fetchone()[0]
 
-        cursor.execute("""
-            SELECT level, COUNT(*) as count 
-            FROM logs 
-            GROUP BY level 
-            ORDER BY count DESC
-        """)
-        level_stats = dict(cursor.fetchall())
+@app.get("/issues", summary="Repeated Logs (Issues)")
+async def issues_route(
+        since: Optional[str] = Query(None, description="Issues Seen After This Time (UTC, YYYY-MM-DD HH:MM:SS)"),
+        min_level: Optional[str] = Query(None, description="This Level And More Severe Levels"),
+        limit: int = Query(50, description="Maximum Issues", ge=1, le=MAX_LOGS_PER_REQUEST)
+):
+    """
+    Logs Grouped By Fingerprint (Level + Message With Numbers / UUIDs / Paths Masked + Tags), Last Seen First
 
-        # Stats 24 Hour
-        yesterday = (datetime.now() - timedelta(days=1)).isoformat()
-        cursor.execute("SELECT COUNT(*) FROM logs WHERE created_at > ?", (yesterday,))
-        last_24h = cursor.fetchone()[0]
+    - **since**: Only issues seen after this time
+    - **min_level**: `ERROR` == ERROR, CRITICAL
+    """
+    query = '''
+        SELECT fingerprint, level, template, tags, first_seen, last_seen, count, last_log_id
+        FROM issues WHERE TRUE
+    '''
+    params = []
+    try:
+        if since:
+            query += " AND last_seen > ?"
+            params.append(since)
+        if min_level:
+            levels = levels_from(min_level)
+            query += f" AND level IN ({','.join('?' * len(levels))})"
+            params += levels
+        query += " ORDER BY last_seen DESC LIMIT ?"
+        params.append(limit)
+
+        with db.read() as conn:
+            rows = conn.execute(query, params).fetchall()
 
-        # Stats 7 day
-        last_week = (datetime.now() - timedelta(days=7)).isoformat()
-        cursor.execute("SELECT COUNT(*) FROM logs WHERE created_at > ?", (last_week,))
-        last_7days = cursor.fetchone()[0]
+        return {
+            "issues": [{
+                "fingerprint": row[0],
+                "level": row[1],
+                "template": row[2],
+                "tags": json.loads(row[3]) if row[3] else [],
+                "first_seen": row[4],
+                "last_seen": row[5],
+                "count": row[6],
+                "last_log_id": row[7]
+            } for row in rows]
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error Fetch Issues: {str(e)}")
 
-        # Last Log
-        cursor.execute("SELECT timestamp FROM logs ORDER BY created_at DESC LIMIT 1")
-        last_log_row = cursor.fetchone()
-        last_log = last_log_row[0] if last_log_row else None
 
-        conn.close()
+@app.get("/stats", summary="Stats Logs")
+async def get_stats_route():
+    try:
+        with db.snapshot() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT level, SUM(count) as count
+                FROM log_rollups
+                WHERE period = 'h' AND tag = ''
+                GROUP BY level
+                ORDER BY count DESC
+            """)
+            level_stats = dict(cursor.fetchall())
+            total_logs = sum(level_stats.values())
+
+            cursor.execute("""
+                SELECT tag, SUM(count) as count
+                FROM log_rollups
+                WHERE period = 'h' AND tag != ''
+                GROUP BY tag
+                ORDER BY count DESC
+                LIMIT 20
+            """)
+            tag_stats = dict(cursor.fetchall())
+
+            # Stats 24 Hour
+            last_24h = count_logs_since(conn, created_at_cutoff(timedelta(days=1)))
+
+            # Stats 7 day
+            last_7days = count_logs_since(conn, created_at_cutoff(timedelta(days=7)))
+
+            # Last Log (Newest Partition)
+            partitions = log_partitions(conn)
+            last_log_row = cursor.execute(
+                f"SELECT timestamp FROM {partition_tables(partitions[-1][0])[0]} ORDER BY seq DESC LIMIT 1"
+            ).fetchone() if partitions else None
+            last_log = last_log_row[0] if last_log_row else None
 
         return {
             "project_name": PROJECT_NAME,
             "total_logs": total_logs,
             "level_stats": level_stats,
+            "tag_stats": tag_stats,
             "last_24h": last_24h,
             "last_7days": last_7days,
             "last_log_timestamp": last_log,
@@ -286,7 +2133,7 @@ async def cleanup_logs_route(
         seconds: int = Query(None, description="Delete logs older than this number of seconds."),):
     """Clear logs older than a specified number of days"""
     try:
-        deleted_count = cleanup_old_logs(days, seconds)
+        deleted_count = await run_in_threadpool(logger_api.cleanup, days, seconds)
         return {
             "success": True,
             "deleted_count": deleted_count,
@@ -300,10 +2147,8 @@ async def cleanup_logs_route(
 async def health_check_route():
     """Checking API health status"""
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1")
-        conn.close()
+        with db.read() as conn:
+            conn.execute("SELECT 1")
 
         return {
             "status": "healthy",
@@ -315,12 +2160,24 @@ async def health_check_route():
         raise HTTPException(status_code=503, detail=f"Service unavailable:{str(e)}")
 
 
+@app.get("/metrics", summary="Metrics (Prometheus)")
+async def metrics_route():
+    """Counters, Latency Histograms And Database Sizes (Prometheus Text Format)"""
+    if logger_api.writer is None:
+        text = metrics.render()
+    else:  # Writer totals + this worker's own series (each scrape may reach another worker)
+        writer_families = await run_in_threadpool(logger_api.writer.call, 'metrics')
+        text = metrics.render(writer_families, labels=f'process="worker-{os.getpid()}"')
+    return Response(text, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # Helper Class
 class ProjectLogger:
 
-    def __init__(self, project_name: str = PROJECT_NAME):
+    def __init__(self, project_name: str = PROJECT_NAME, buffered: bool = LOG_BUFFERED, **buffer_options):
         self.project_name = project_name
         self.api = logger_api
+        self.buffer = LogBuffer(self.api, **buffer_options) if buffered else None
 
     def log(self, level: str, message: str, tags: List[str] = None, **extra):
         log_entry = LogEntry(
@@ -329,7 +2186,26 @@ class ProjectLogger:
             tags=tags or [],
             extra=extra
         )
-        return self.api.add_log(log_entry)
+        if self.buffer is None:
+            return self.api.add_log(log_entry)
+
+        row = build_log_row(log_entry)
+        try:
+            self.buffer.put(row)
+        except LogBufferClosed:  # After close() (e.g. atexit): write directly
+            self.api.add_rows([row])
+        return row[0]
+
+    def flush(self, timeout: Optional[float] = None):
+        """Write Queued Logs (Buffered Mode)"""
+        if self.buffer is not None:
+            return self.buffer.flush(timeout)
+        return True
+
+    def close(self):
+        """Drain And Stop (Buffered Mode)"""
+        if self.buffer is not None:
+            self.buffer.close()
 
     def error(self, message: str, tags: List[str] = None, **extra):
         return self.log("ERROR", message, tags, **extra)
@@ -350,6 +2226,14 @@ class ProjectLogger:
 project_logger = ProjectLogger()
 
 if __name__ == "__main__":
+    # Migration: python logger_api.py recompress [--train] [--vacuum]
+    if sys.argv[1:2] == ["recompress"]:
+        print(f"{recompress_logs(train='--train' in sys.argv)} logs recompressed ({DATABASE_PATH})")
+        if "--vacuum" in sys.argv:
+            with db.write(immediate=False) as conn:
+                conn.execute("VACUUM")
+        sys.exit(0)
+
     # Test
     print(f"Setting up the API for the project:{PROJECT_NAME}")
     print(f"Database path:{DATABASE_PATH}")
@@ -359,9 +2243,24 @@ if __name__ == "__main__":
     project_logger.success("Database connected successfully.", tags=["database", "startup"])
 
     # Run Srrver
-    uvicorn.run(
-        app,
-        host="127.0.0.1",
-        port=8113,
-        log_level="info"
-    )
\ No newline at end of file
+    if API_WORKERS > 1:
+        # Workers parse / validate requests, one process writes (no "database is locked" between workers)
+        log_writer = LogWriterProcess()
+        log_writer.start()
+        try:
+            uvicorn.run(
+                "logger_api:app",
+                host=API_HOST,
+                port=API_PORT,
+                log_level="info",
+                workers=API_WORKERS
+            )
+        finally:
+            log_writer.stop()
+    else:
+        uvicorn.run(
+            app,
+            host=API_HOST,
+            port=API_PORT,
+            log_level="info"
+        )
\ No newline at end of file